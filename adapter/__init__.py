@@ -0,0 +1 @@
+"""Adapter pattern examples."""
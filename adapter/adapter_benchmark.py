@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""Memory and latency of the dict copying Adapter vs the generated adapters.
+
+Also the lazy adapt_all() and the thread pool of execute_all().
+"""
+
+import time
+import tracemalloc
+from typing import Callable, List
+
+from adapter.computer_human_adapter import Adapter, adapt_all, adapters, execute_all
+
+COUNT = 1_000_000
+SLOW_COUNT = 2_000
+
+
+class Reader:
+    """Human-like adaptee, without printing."""
+
+    def __init__(self, name: str, age: int, city: str) -> None:
+        self.name = name
+        self.age = age
+        self.city = city
+
+    def read(self) -> str:
+        return self.name
+
+
+class SlowReader(Reader):
+    """I/O bound adaptee, every read waits for a millisecond."""
+
+    def read(self) -> str:
+        time.sleep(0.001)
+        return self.name
+
+
+def per_adapter(label: str, adapt: Callable, readers: List[Reader]) -> list:
+    tracemalloc.start()
+    start = time.perf_counter()
+    adapted = [adapt(reader) for reader in readers]
+    seconds = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:10} {memory / COUNT:7.1f} B/adapter  create {seconds / COUNT * 1e9:6.0f} ns')
+    return adapted
+
+
+def per_call(label: str, run: Callable, adapted: list) -> None:
+    start = time.perf_counter()
+    run(adapted)
+    print(f'{label:32} {(time.perf_counter() - start) / COUNT * 1e9:6.0f} ns')
+
+
+def bulk(count: int) -> None:
+    slow = [SlowReader(f'reader {i}', i, 'Brno') for i in range(count)]
+    start = time.perf_counter()
+    expected = [adapter.execute() for adapter in adapt_all(slow, {'execute': 'read'})]
+    print(f'{count:,} slow reads one by one {time.perf_counter() - start:6.2f} s')
+    for workers in 8, 32:
+        start = time.perf_counter()
+        results = list(execute_all(slow, {'execute': 'read'}, workers=workers))
+        assert results == expected
+        print(f'{count:,} slow reads, {workers:2} workers {time.perf_counter() - start:6.2f} s')
+
+
+def main() -> int:
+    readers = [Reader(f'reader {i}', i % 100, 'Prague') for i in range(COUNT)]
+    copied = per_adapter('Adapter', lambda reader: Adapter(reader, reader.read), readers)
+    generated = per_adapter('generated', lambda reader: adapters.adapt(reader, execute='read'), readers)
+
+    adapter_class = adapters.adapter_class(Reader, {'execute': 'read'})
+    per_adapter('class', adapter_class, readers)
+
+    for label, adapted in ('Adapter', copied), ('generated', generated):
+        per_call(f'{label} execute()', lambda items: [item.execute() for item in items], adapted)
+        per_call(f'{label} .name', lambda items: [item.name for item in items], adapted)
+
+    readers[0].name = 'renamed'
+    print(f'after a rename: Adapter {copied[0].name!r}, generated {generated[0].name!r}')
+    del copied, generated
+
+    tracemalloc.start()
+    names = sum(len(adapter.name) for adapter in adapt_all(readers, {'execute': 'read'}))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'adapt_all over {COUNT:,} objects: peak {peak / 1024:.0f} KiB ({names:,} characters read)')
+
+    bulk(SLOW_COUNT)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+"""Bridging adapters between blocking and asyncio interfaces.
+
+AsyncAdapter lets asyncio code await the methods of a blocking object, like
+Computer.execute() or Human.read(); the calls run in a thread pool, so the
+event loop keeps running. SyncAdapter is the other direction, it lets blocking
+code call the coroutine methods of an async object; the coroutines run in a
+persistent event loop in a background thread.
+
+The AsyncAdapters share one thread pool. The background loop keeps a default
+executor of its own: a bridged blocking call may wait in a pool thread for a
+coroutine of the loop, which must never need a thread of the same full pool.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from adapter.computer_human_adapter import Computer, adapters
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix='bridge')
+        return _executor
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """The event loop running in a daemon thread, started on the first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            loop.call_soon(started.set)
+            threading.Thread(target=loop.run_forever, name='bridge-loop', daemon=True).start()
+            started.wait()
+            _loop = loop
+        return _loop
+
+
+class AsyncAdapter:
+    """Awaitable methods of a blocking object."""
+
+    __slots__ = ('adaptee', 'executor', '_methods')
+
+    def __init__(self, adaptee, executor: Optional[ThreadPoolExecutor] = None) -> None:
+        self.adaptee = adaptee
+        self.executor = executor or shared_executor()
+        self._methods: Dict[str, Callable] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.adaptee, name)
+        if not callable(attribute):
+            return attribute
+        method = self._methods.get(name)
+        if method is None:
+            method = self._methods[name] = self._wrap(name)
+        return method
+
+    def _wrap(self, name: str) -> Callable:
+        adaptee, executor = self.adaptee, self.executor
+
+        async def method(*args, **kwargs):
+            # looked up on every call, like a plain adaptee.name(...)
+            call = getattr(adaptee, name)
+            if kwargs:
+                call = functools.partial(call, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(executor, call, *args)
+
+        method.__name__ = name
+        return method
+
+    def __str__(self) -> str:
+        return str(self.adaptee)
+
+
+class SyncAdapter:
+    """Blocking methods of an async object."""
+
+    __slots__ = ('adaptee', 'loop', '_methods')
+
+    def __init__(self, adaptee, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.adaptee = adaptee
+        self.loop = loop or background_loop()
+        self._methods: Dict[str, Callable] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.adaptee, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+        method = self._methods.get(name)
+        if method is None:
+            method = self._methods[name] = self._wrap(name)
+        return method
+
+    def _wrap(self, name: str) -> Callable:
+        adaptee, loop = self.adaptee, self.loop
+
+        def method(*args, **kwargs):
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                raise RuntimeError(f'{name}() would block its own event loop, await it instead')
+            coroutine = getattr(adaptee, name)(*args, **kwargs)
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        method.__name__ = name
+        return method
+
+    def __str__(self) -> str:
+        return str(self.adaptee)
+
+
+class AsyncHuman:
+    """Human with the asyncio interface of our services."""
+
+    def __init__(self, name) -> None:
+        self.name = name
+
+    async def read(self) -> None:
+        await asyncio.sleep(0)
+        print(f"Human {self.name} is reading asynchronously.")
+
+
+def main():
+    async def service() -> None:
+        computers = [AsyncAdapter(Computer(name)) for name in ('Asus', 'Dell', 'Lenovo')]
+        # the blocking calls run in the shared pool, the loop is free meanwhile
+        await asyncio.gather(*(computer.execute() for computer in computers))
+
+    asyncio.run(service())
+
+    # a legacy caller of execute() driving an async human
+    adapter = adapters.adapt(SyncAdapter(AsyncHuman('Michal')), execute='read')
+    adapter.execute()
+
+
+if __name__ == '__main__':
+    main()
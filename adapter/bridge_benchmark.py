@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""Overhead per call of the sync/async bridging adapters."""
+
+import asyncio
+import time
+
+from adapter.async_bridge import AsyncAdapter, SyncAdapter
+from adapter.computer_human_adapter import Computer
+
+CALLS = 20_000
+
+
+class QuietComputer(Computer):
+
+    def execute(self) -> str:
+        return self.name
+
+
+class SlowComputer(Computer):
+    """Blocking I/O, like a legacy execute() talking to a device."""
+
+    def execute(self) -> str:
+        time.sleep(0.01)
+        return self.name
+
+
+class AsyncComputer:
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    async def execute(self) -> str:
+        return self.name
+
+
+def report(label: str, seconds: float, calls: int = CALLS) -> None:
+    print(f'{label:42} {seconds / calls * 1e6:8.2f} us/call')
+
+
+async def awaited() -> None:
+    computer = QuietComputer('Asus')
+    adapter = AsyncAdapter(computer)
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        computer.execute()
+    report('direct execute()', time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await adapter.execute()
+    report('await AsyncAdapter.execute(), one by one', time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(adapter.execute() for _ in range(CALLS)))
+    report('AsyncAdapter.execute(), gathered', time.perf_counter() - start)
+
+    native = AsyncComputer('Asus')
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await native.execute()
+    report('await a native coroutine', time.perf_counter() - start)
+
+    slow = [AsyncAdapter(SlowComputer(f'computer {i}')) for i in range(100)]
+    start = time.perf_counter()
+    await asyncio.gather(*(computer.execute() for computer in slow))
+    print(f'100 blocking 10 ms execute() calls gathered in {time.perf_counter() - start:.2f} s')
+
+
+def blocking() -> None:
+    adapter = SyncAdapter(AsyncComputer('Asus'))
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        adapter.execute()
+    report('SyncAdapter.execute() from sync code', time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        asyncio.run(AsyncComputer('Asus').execute())
+    report('asyncio.run() per call, for comparison', time.perf_counter() - start)
+
+
+def main() -> int:
+    asyncio.run(awaited())
+    blocking()
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
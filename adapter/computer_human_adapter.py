@@ -1,5 +1,15 @@
 """Adapter python design pattern example."""
 
+from __future__ import annotations
+
+from collections import deque
+from operator import attrgetter
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+
 class Computer:
     """Computer is a legacy interface with execute() method."""
 
@@ -34,6 +44,147 @@ class Adapter:
         return str(self.adaptee)
 
 
+class AdapterRegistry:
+    """Generated adapter classes, one per (adaptee type, method mapping).
+
+    An adapter instance holds just a reference to the adaptee. Mapped methods
+    call the adaptee's method, every other attribute is read from (and written
+    to) the adaptee, so it never goes stale. The instance attributes of the
+    first adaptee get properties of the class, the rest goes through
+    __getattr__; a generated class is never changed afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._classes: Dict[Tuple[type, Tuple[Tuple[str, str], ...]], type] = {}
+
+    def adapter_class(self, adaptee_type: type, mapping: Dict[str, str], attributes: Iterable[str] = ()) -> type:
+        """mapping is {legacy method name: adaptee method name}.
+
+        attributes are the names a new class reads through properties.
+        """
+        key = (adaptee_type, tuple(sorted(mapping.items())))
+        cls = self._classes.get(key)
+        if cls is None:
+            cls = self._classes[key] = self._make_class(adaptee_type, mapping, attributes)
+        return cls
+
+    def adapt(self, adaptee, **mapping: str):
+        return self.adapter_class(type(adaptee), mapping, _attributes(adaptee))(adaptee)
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    @staticmethod
+    def _make_class(adaptee_type: type, mapping: Dict[str, str], attributes: Iterable[str]) -> type:
+        namespace = {
+            '__slots__': ('adaptee',),
+            '__init__': _adapter_init,
+            '__getattr__': _adapter_getattr,
+            '__setattr__': _adapter_setattr,
+            '__str__': _adapter_str,
+        }
+        for name in attributes:
+            if name not in namespace and not _is_dunder(name):
+                namespace[name] = _live_attribute(name)
+        for name, adapted_name in mapping.items():
+            # adapter.execute is the bound adaptee.read, looked up in C
+            namespace[name] = property(attrgetter(f'adaptee.{adapted_name}'))
+        return type(f'{adaptee_type.__name__}Adapter', (), namespace)
+
+
+def _adapter_init(self, adaptee) -> None:
+    object.__setattr__(self, 'adaptee', adaptee)
+
+
+def _is_dunder(name: str) -> bool:
+    return name.startswith('__') and name.endswith('__')
+
+
+def _attributes(adaptee) -> Iterable[str]:
+    return getattr(adaptee, '__dict__', ())
+
+
+def _adapter_getattr(self, name: str):
+    # the adaptee slot is unset while copy or pickle rebuild an adapter, and
+    # the protocols' dunder lookups must not reach the adaptee
+    if name == 'adaptee' or _is_dunder(name):
+        raise AttributeError(name)
+    return getattr(self.adaptee, name)
+
+
+def _adapter_setattr(self, name: str, value) -> None:
+    if name == 'adaptee' or _is_dunder(name):
+        object.__setattr__(self, name, value)
+    else:
+        setattr(self.adaptee, name, value)
+
+
+def _adapter_str(self) -> str:
+    return str(self.adaptee)
+
+
+def _live_attribute(name: str) -> property:
+    def fset(self, value) -> None:
+        setattr(self.adaptee, name, value)
+
+    def fdel(self) -> None:
+        delattr(self.adaptee, name)
+
+    return property(attrgetter(f'adaptee.{name}'), fset, fdel)
+
+
+adapters = AdapterRegistry()
+
+
+def adapt_all(
+        iterable: Iterable,
+        mapping: Dict[str, str],
+        registry: AdapterRegistry = adapters,
+        ) -> Iterator:
+    """Adapt the objects one by one, as they are consumed."""
+    classes: Dict[type, type] = {}
+    for adaptee in iterable:
+        adaptee_type = type(adaptee)
+        cls = classes.get(adaptee_type)
+        if cls is None:
+            cls = classes[adaptee_type] = registry.adapter_class(adaptee_type, mapping, _attributes(adaptee))
+        yield cls(adaptee)
+
+
+def execute_all(
+        iterable: Iterable,
+        mapping: Dict[str, str],
+        method: str = 'execute',
+        workers: int = 8,
+        max_pending: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        ) -> Iterator:
+    """Call the adapted method of every object in a thread pool.
+
+    Meant for I/O bound adaptees. The results are yielded in the order of
+    the objects, at most max_pending calls (2 * workers by default) run or
+    wait at a time, so the collection is still consumed lazily.
+    """
+    # imported here, most users of the adapters never need a thread pool
+    from concurrent.futures import ThreadPoolExecutor
+
+    max_pending = max_pending or 2 * workers
+    pool = executor or ThreadPoolExecutor(workers, thread_name_prefix='adapter')
+    pending: Deque[Future] = deque()
+    try:
+        for adapter in adapt_all(iterable, mapping):
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(pool.submit(getattr(adapter, method)))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=False)
+
+
 def main():
     computer = Computer('Asus')
     human = Human('Michal')
@@ -45,6 +196,16 @@ def main():
     for obj in computer, adapter:
         print(obj.name)
 
+    # generated adapter class, the name is read from the human on every access
+    adapter = adapters.adapt(human, execute='read')
+    human.name = 'Michal Jr.'
+    adapter.execute()
+    print(adapter.name)
+
+    humans = (Human(name) for name in ('Anna', 'Petr', 'Jana'))
+    for adapter in adapt_all(humans, {'execute': 'read'}):
+        adapter.execute()
+
 
 if __name__ == '__main__':
     main()
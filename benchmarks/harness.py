@@ -0,0 +1,109 @@
+"""Timing, statistics and baseline comparison for the pattern benchmarks.
+
+Every benchmark is a function without arguments. It is calibrated once, so a
+sample takes at least MIN_SAMPLE_TIME, warmed up, and then sampled REPEAT
+times with the garbage collector off. A result is the median time per call
+with the interquartile range, which are both robust to the odd slow sample,
+and the fastest sample. Noise only ever adds time, so the baseline is
+compared by the fastest samples, which vary the least from run to run.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+REPEAT = 15
+WARMUP = 3
+MIN_SAMPLE_TIME = 0.02
+
+
+@dataclass
+class Result:
+    name: str
+    median_ns: float
+    iqr_ns: float
+    loops: int
+    repeat: int
+    min_ns: float = 0.0
+
+    def __str__(self) -> str:
+        return f'{self.name:42} {self.median_ns:12,.1f} ns  ± {self.iqr_ns:9,.1f} ns (IQR)'
+
+
+def _sample(func: Callable[[], object], loops: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        func()
+    return (time.perf_counter_ns() - start) / loops
+
+
+def calibrate(func: Callable[[], object], min_time: float = MIN_SAMPLE_TIME) -> int:
+    loops = 1
+    while True:
+        if _sample(func, loops) * loops >= min_time * 1e9:
+            return loops
+        loops *= 2
+
+
+def measure(name: str, func: Callable[[], object], repeat: int = REPEAT) -> Result:
+    loops = calibrate(func)
+    for _ in range(WARMUP):
+        _sample(func, loops)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = [_sample(func, loops) for _ in range(repeat)]
+    finally:
+        if enabled:
+            gc.enable()
+    q1, median, q3 = statistics.quantiles(samples, n=4)
+    return Result(name, median, q3 - q1, loops, repeat, min(samples))
+
+
+def save(results: List[Result], path: str) -> None:
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'results': {result.name: asdict(result) for result in results},
+    }
+    with open(path, encoding='utf-8', mode='w') as fh:
+        json.dump(report, fh, indent=2)
+        fh.write('\n')
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path, encoding='utf-8', mode='r') as fh:
+        return json.load(fh)['results']
+
+
+def fastest(result: dict) -> float:
+    # baselines saved before min_ns was recorded only have the median
+    return result.get('min_ns') or result['median_ns']
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print the change against the baseline, return the regressed names.
+
+    A benchmark regressed when its fastest sample grew by more than threshold
+    (0.25 is 25 %) and the slowdown is larger than the noise of both runs.
+    """
+    regressions = []
+    for result in results:
+        old: Optional[dict] = baseline.get(result.name)
+        if old is None:
+            print(f'{result.name:42} new')
+            continue
+        now = fastest(asdict(result))
+        change = now / fastest(old) - 1
+        noise = result.iqr_ns + old['iqr_ns']
+        regressed = change > threshold and now - fastest(old) > noise
+        if regressed:
+            regressions.append(result.name)
+        print(f'{result.name:42} {change:+8.1%}{"  REGRESSION" if regressed else ""}')
+    return regressions
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""Import time budgets - importing an example has to be fast and quiet.
+
+Every module is imported in a fresh interpreter with 'python -X importtime'.
+The best cumulative time of a few runs has to fit the budget, the import
+must not print anything and must not load a heavy dependency (tkinter,
+requests), those are only loaded when used. The CLI start-up is checked the
+same way.
+
+A budget is the time measured when it was set, plus a margin. Every run is
+paired with an import of a stdlib module (REFERENCE) and the best times are
+compared relative to the best reference time, so a slower or busier machine
+scales the budgets instead of failing them.
+
+Usage:
+    import_budget.py [--runs N] [--margin FRACTION]
+    import_budget.py --measure [--runs N]
+
+--measure prints new BASELINE times. The exit code is 1 when a check fails.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('tkinter', 'requests')
+
+# best cumulative import times in milliseconds, scaled to a machine where
+# the REFERENCE import takes its time; re-measure all of them with --measure
+# (after python -m compileall, a missing .pyc counts as import time)
+REFERENCE = ('json', 10.0)
+BASELINE: Dict[str, float] = {
+    'patterns.__main__': 0.4,
+    'adapter.computer_human_adapter': 13.2,
+    'factory.parser': 15.6,
+    'factory.video_audio_codec_factory': 13.4,
+    'flightweight.flighweight': 7.1,
+    'mvc.mvc_example1': 16.7,
+    'mvc.mvc_with_strategy': 21.4,
+    'observer.observer': 0.6,
+    'proxy.proxy_division': 21.7,
+    'proxy.proxy_rest_api': 19.3,
+    'strategy.duck_strategy': 13.4,
+}
+# the timer noise of a tiny import is not relative to its time
+SLACK = 1.0
+
+CHECK = '''
+import sys, {module}
+print(','.join(name for name in {heavy!r} if type(sys.modules.get(name)).__name__ == 'module'))
+'''
+
+
+def import_once(module: str) -> Tuple[float, str, List[str]]:
+    """(cumulative import time in ms, printed output, loaded heavy modules)."""
+    done = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHECK.format(module=module, heavy=HEAVY)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative: Optional[float] = None
+    for line in done.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith('import time:') and line.rsplit('|', 1)[-1].strip() == module:
+            cumulative = int(line.split('|')[1]) / 1000
+    if cumulative is None:
+        raise RuntimeError(f'no import time of {module} in:\n{done.stderr}')
+    *printed, heavy = done.stdout.split('\n')[:-1]
+    return cumulative, '\n'.join(printed), [name for name in heavy.split(',') if name]
+
+
+def measure(module: str, runs: int) -> Tuple[float, float, str, List[str]]:
+    """(best ms, best ms of the paired reference imports, printed, heavy).
+
+    A busy machine only ever slows a run down, so the best times are the
+    steadiest.
+    """
+    times, reference_times = [], []
+    for _ in range(runs):
+        reference_times.append(import_once(REFERENCE[0])[0])
+        cumulative, printed, heavy = import_once(module)
+        times.append(cumulative)
+    return min(times), min(reference_times), printed, heavy
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Check the import time budgets.')
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--margin', type=float, default=0.3,
+                        help='allowed growth over the baseline, 0.3 is 30 %%')
+    parser.add_argument('--measure', action='store_true', help='print the baseline of this machine')
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        for module in BASELINE:
+            measured, reference, _, _ = measure(module, args.runs)
+            print(f"    '{module}': {measured / reference * REFERENCE[1]:.1f},")
+        return 0
+
+    failures = 0
+    for module, baseline in BASELINE.items():
+        measured, reference, printed, heavy = measure(module, args.runs)
+        budget = (baseline * (1 + args.margin) + SLACK) * reference / REFERENCE[1]
+        problems = []
+        if measured > budget:
+            problems.append('over budget')
+        if printed:
+            problems.append(f'prints {printed!r}')
+        if heavy:
+            problems.append(f'loads {", ".join(heavy)}')
+        failures += bool(problems)
+        print(f'{module:36} {measured:6.1f} ms of {budget:5.1f} ms  {"; ".join(problems) or "OK"}')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+"""Microbenchmarks of the hot paths of the pattern examples.
+
+Every benchmark is a setup function, which imports what it needs, prepares
+the data and returns the function to time. A benchmark whose dependency is
+not installed is skipped. Whatever the examples print goes to /dev/null.
+
+Usage:
+    run.py [-k SUBSTRING] [--output RESULTS_JSON]
+           [--baseline BASELINE_JSON] [--threshold 0.25] [--confirm 3] [--save-baseline]
+
+With --baseline the results are compared to the stored ones and the run fails
+(exit code 1) when a benchmark got slower by more than the threshold. A
+suspected regression is measured again in --confirm fresh processes and only
+fails when even the fastest of them is still too slow, one noisy run is not
+enough.
+"""
+
+import argparse
+import atexit
+import contextlib
+import functools
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+from harness import Result, compare, load, measure, save
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+sys.path.insert(0, ROOT)
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('Berry.__new__')
+def berry_new():
+    from flightweight.flighweight import Berry, BerryType
+    return lambda: Berry(BerryType.strawberry)
+
+
+@benchmark('Publisher.notify, 10 subscribers')
+def publisher_notify():
+    from observer.observer import Group, Publisher, Subscriber
+
+    class QuietSubscriber(Subscriber):
+        def update(self, publisher: Publisher) -> None:
+            pass
+
+    publisher = Publisher('sensor')
+    group = Group('sensors')
+    for number in range(10):
+        publisher.register(QuietSubscriber(f'subscriber {number}'), group)
+    return publisher.notify
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Local stand-in of postman-echo.com/get."""
+
+    def do_GET(self) -> None:
+        body = json.dumps({'args': {'path': self.path}, 'headers': dict(self.headers)}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def echo_server() -> str:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_address[1]}/get'
+
+
+@benchmark('GetUrlCached.get_data, cache hit')
+def get_url_cached_hit():
+    from proxy.proxy_rest_api import GetUrlCached
+    geturl, url = GetUrlCached(), f'{echo_server()}?foo=bar'
+    geturl.get_data(url)
+    return lambda: geturl.get_data(url)
+
+
+@benchmark('GetUrlCached.get_data, cache miss')
+def get_url_cached_miss():
+    from proxy.proxy_rest_api import GetUrlCached
+    geturl, url = GetUrlCached(), echo_server()
+    counter = itertools.count()
+    return lambda: geturl.get_data(f'{url}?foo={next(counter)}')
+
+
+@functools.lru_cache(maxsize=None)
+def scratch_directory() -> str:
+    """One temporary directory per run, removed when the run ends."""
+    directory = tempfile.TemporaryDirectory(prefix='pattern_benchmarks')
+    atexit.register(directory.cleanup)
+    return directory.name
+
+
+def parser_files() -> Dict[str, str]:
+    directory = scratch_directory()
+    files = {}
+    for extension, content in (
+            ('json', json.dumps({'pizza': [{'name': f'pizza {i}', 'price': i} for i in range(20)]})),
+            ('xml', '<menu>' + ''.join(f'<pizza price="{i}">pizza {i}</pizza>' for i in range(20)) + '</menu>'),
+            ):
+        files[extension] = os.path.join(directory, f'menu.{extension}')
+        with open(files[extension], encoding='utf-8', mode='w') as fh:
+            fh.write(content)
+    return files
+
+
+@benchmark('parser_factory, json')
+def parser_factory_json():
+    from factory.parser import parser_factory
+    path = parser_files()['json']
+    return lambda: parser_factory(path)
+
+
+@benchmark('parser_factory, xml')
+def parser_factory_xml():
+    from factory.parser import parser_factory
+    path = parser_files()['xml']
+    return lambda: parser_factory(path)
+
+
+@benchmark('CodecFactory.make, lossless')
+def codec_factory_lossless():
+    from factory.video_audio_codec_factory import LosslessCodecFactory
+    return LosslessCodecFactory().make
+
+
+@benchmark('CodecFactory.make, compressed')
+def codec_factory_compressed():
+    from factory.video_audio_codec_factory import CompressedlessCodecFactory
+    return CompressedlessCodecFactory().make
+
+
+@benchmark('Duck.display')
+def duck_display():
+    from strategy.duck_strategy import Duck, JetFlyingStrategy, SimpleQuackStrategy, strategies
+    duck = Duck(
+        name='cloud duck',
+        flying_behaviour=strategies.get(JetFlyingStrategy),
+        quack_behaviour=strategies.get(SimpleQuackStrategy),
+    )
+    return duck.display
+
+
+@benchmark('ProxyDivision.div')
+def proxy_division():
+    from proxy.proxy_division import ProxyDivision
+    division = ProxyDivision()
+    return lambda: division.div(1, 2)
+
+
+def run(names: List[str]) -> List[Result]:
+    results = []
+    with open(os.devnull, encoding='utf-8', mode='w') as sink:
+        for name in names:
+            try:
+                with contextlib.redirect_stdout(sink):
+                    result = measure(name, BENCHMARKS[name]())
+            except ImportError as err:
+                print(f'{name:42} skipped, {err}')
+                continue
+            print(result, flush=True)
+            results.append(result)
+    return results
+
+
+def remeasure(name: str, processes: int) -> Result:
+    """The fastest result of the benchmark in fresh interpreters."""
+    results = []
+    for _ in range(processes):
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--only', name, '--output', output.name],
+                check=True, stdout=subprocess.DEVNULL,
+            )
+            results.append(Result(**load(output.name)[name]))
+    return min(results, key=lambda result: result.min_ns)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the pattern microbenchmarks.')
+    parser.add_argument('-k', dest='select', default='', help='run benchmarks containing this')
+    parser.add_argument('--only', action='append', default=[], help='run just this benchmark')
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--baseline', help=f'compare with stored results, e.g. {BASELINE}')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown against the baseline, 0.25 is 25 %%')
+    parser.add_argument('--confirm', type=int, default=3, metavar='PROCESSES',
+                        help='fresh processes measuring a suspected regression again')
+    parser.add_argument('--save-baseline', action='store_true', help=f'store the results to {BASELINE}')
+    args = parser.parse_args(argv)
+
+    names = args.only or [name for name in BENCHMARKS if args.select in name]
+    results = run(names)
+    if args.output:
+        save(results, args.output)
+    if args.save_baseline:
+        save(results, BASELINE)
+    if args.baseline:
+        print(f'\nChange against {args.baseline}')
+        baseline = load(args.baseline)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions and args.confirm:
+            print(f'\nConfirming in {args.confirm} fresh processes')
+            confirmed = [remeasure(name, args.confirm) for name in regressions]
+            regressions = compare(confirmed, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}')
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
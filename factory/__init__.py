@@ -0,0 +1 @@
+"""Factory pattern examples."""
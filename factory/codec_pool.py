@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Object pool on top of the codec factory.
+
+Every CodecFactory.make() call builds brand new codec instances. Real codecs
+have an expensive setup (lookup tables, buffers), so instead of building them
+again and again we keep a bounded pool of already warmed instances per codec
+type and hand them out with acquire/release semantics.
+
+The factory keeps deciding *which* classes to instantiate, the pool only
+decides *when* a new instance is really needed.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple, Type
+
+from factory.video_audio_codec_factory import (
+    AudioCodec,
+    CodecFactory,
+    LosslessCodecFactory,
+    VideoCodec,
+)
+
+Codec = object
+
+
+class PoolStats:
+    """Utilization counters of a single codec type."""
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'PoolStats(created={self.created}, in_use={self.in_use}, '
+            f'peak_in_use={self.peak_in_use}, hits={self.hits}, '
+            f'misses={self.misses}, waits={self.waits})'
+        )
+
+
+class CodecPool:
+    """Bounded, thread-safe pool of codec instances, one free list per type."""
+
+    def __init__(self, max_per_type: int = 8) -> None:
+        if max_per_type < 1:
+            raise ValueError('max_per_type must be at least 1')
+        self.max_per_type = max_per_type
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: Dict[Type, list] = {}
+        self._stats: Dict[Type, PoolStats] = {}
+        self._checked_out: Dict[int, Codec] = {}    # id() -> instance
+
+    def _stats_for(self, codec_type: Type) -> PoolStats:
+        stats = self._stats.get(codec_type)
+        if stats is None:
+            stats = self._stats[codec_type] = PoolStats()
+            self._idle[codec_type] = []
+        return stats
+
+    def prewarm(self, codec_type: Type, count: int) -> None:
+        """Create up to `count` idle instances ahead of time."""
+        with self._lock:
+            stats = self._stats_for(codec_type)
+            count = max(min(count, self.max_per_type - stats.created), 0)
+            # reserve the slots like acquire() does, so nobody overfills the pool
+            stats.created += count
+        # expensive construction happens outside of the lock
+        fresh = []
+        try:
+            for _ in range(count):
+                fresh.append(codec_type())
+        finally:
+            with self._available:
+                stats.created -= count - len(fresh)
+                self._idle[codec_type].extend(fresh)
+                self._available.notify_all()
+
+    def add(self, codec: Codec) -> bool:
+        """Adopt an already built instance as idle, False when the pool is full."""
+        with self._available:
+            stats = self._stats_for(type(codec))
+            if stats.created >= self.max_per_type:
+                return False
+            stats.created += 1
+            self._idle[type(codec)].append(codec)
+            self._available.notify()
+        return True
+
+    def acquire(self, codec_type: Type, timeout: float = None) -> Codec:
+        """Check out an instance, building one only if the pool is not full."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            stats = self._stats_for(codec_type)
+            idle = self._idle[codec_type]
+            while not idle and stats.created >= self.max_per_type:
+                stats.waits += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f'No {codec_type.__name__} available in the pool')
+                self._available.wait(remaining)
+
+            if idle:
+                codec = idle.pop()
+                self._checked_out[id(codec)] = codec
+                stats.hits += 1
+            else:
+                # reserve the slot, build the instance outside of the lock
+                codec = None
+                stats.created += 1
+                stats.misses += 1
+            stats.in_use += 1
+            stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+
+        if codec is None:
+            try:
+                codec = codec_type()
+            except Exception:
+                with self._available:
+                    stats.created -= 1
+                    stats.in_use -= 1
+                    self._available.notify()
+                raise
+            with self._lock:
+                self._checked_out[id(codec)] = codec
+        return codec
+
+    def release(self, codec: Codec) -> None:
+        """Return a checked out instance back to its free list."""
+        with self._available:
+            # only a checked out instance, a second release would hand it out twice
+            if self._checked_out.get(id(codec)) is not codec:
+                raise ValueError(f'{codec!r} is not checked out of this pool')
+            del self._checked_out[id(codec)]
+            stats = self._stats[type(codec)]
+            stats.in_use -= 1
+            self._idle[type(codec)].append(codec)
+            self._available.notify()
+
+    @contextmanager
+    def checkout(self, codec_type: Type, timeout: float = None) -> Iterator[Codec]:
+        codec = self.acquire(codec_type, timeout)
+        try:
+            yield codec
+        finally:
+            self.release(codec)
+
+    def stats(self) -> Dict[str, PoolStats]:
+        with self._lock:
+            return {codec_type.__name__: stats for codec_type, stats in self._stats.items()}
+
+
+class PooledCodecFactory(CodecFactory):
+    """Pooled mode of an existing CodecFactory.
+
+    The wrapped factory is asked once which codec types it makes, the
+    instances of that call are the first ones of the pool.
+    """
+
+    def __init__(self, factory: CodecFactory, pool: CodecPool = None, prewarm: int = 0) -> None:
+        self.factory = factory
+        self.pool = pool if pool is not None else CodecPool()
+        sample = factory.make()
+        self.codec_types = tuple(type(codec) for codec in sample)
+        for codec in sample:
+            self.pool.add(codec)
+        for codec_type in self.codec_types:
+            self.pool.prewarm(codec_type, prewarm - 1)
+
+    def make(self, timeout: float = None) -> Tuple[AudioCodec, VideoCodec]:
+        """Acquire one instance of every codec type, release() them when done."""
+        acquired = []
+        try:
+            for codec_type in self.codec_types:
+                acquired.append(self.pool.acquire(codec_type, timeout))
+        except Exception:
+            self.release(acquired)
+            raise
+        return tuple(acquired)
+
+    def release(self, codecs) -> None:
+        for codec in codecs:
+            self.pool.release(codec)
+
+    @contextmanager
+    def checkout(self, timeout: float = None) -> Iterator[Tuple[AudioCodec, VideoCodec]]:
+        codecs = self.make(timeout)
+        try:
+            yield codecs
+        finally:
+            self.release(codecs)
+
+
+# Benchmark - codecs with an expensive setup, like the real ones.
+class TableWAVAudioCodec(AudioCodec):
+
+    def __init__(self) -> None:
+        self.table = [i * i % 65521 for i in range(20_000)]
+
+    def encode(self):
+        return self.table[0]
+
+
+class TableAVIVideoCodec(VideoCodec):
+
+    def __init__(self) -> None:
+        self.buffer = bytearray(1 << 20)
+        self.table = [i * 7 % 65521 for i in range(20_000)]
+
+    def encode(self):
+        return self.table[0]
+
+
+class TableLosslessCodecFactory(CodecFactory):
+
+    def make(self) -> Tuple[TableAVIVideoCodec, TableWAVAudioCodec]:
+        return (TableAVIVideoCodec(), TableWAVAudioCodec())
+
+
+def benchmark(factory: CodecFactory, rounds: int = 2000, threads: int = 4) -> None:
+    """Compare make() throughput with and without pooling."""
+
+    def run(make, release, per_thread: int) -> None:
+        for _ in range(per_thread):
+            codecs = make()
+            for codec in codecs:
+                codec.encode()
+            release(codecs)
+
+    def measure(make, release) -> float:
+        workers = [
+            threading.Thread(target=run, args=(make, release, rounds // threads))
+            for _ in range(threads)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return (rounds // threads * threads) / (time.perf_counter() - start)
+
+    pooled = PooledCodecFactory(factory, CodecPool(max_per_type=threads), prewarm=threads)
+    plain = measure(factory.make, lambda codecs: None)
+    cached = measure(pooled.make, pooled.release)
+
+    name = type(factory).__name__
+    print(f'{name}: plain make()  {plain:12,.0f} pairs/s')
+    print(f'{name}: pooled make() {cached:12,.0f} pairs/s ({cached / plain:.1f}x)')
+    for codec_name, stats in pooled.pool.stats().items():
+        print(f'    {codec_name}: {stats}')
+
+
+def main() -> int:
+    pooled = PooledCodecFactory(LosslessCodecFactory(), CodecPool(max_per_type=2))
+    with pooled.checkout() as (video, audio):
+        video.encode()
+        audio.encode()
+    print(pooled.pool.stats())
+
+    benchmark(TableLosslessCodecFactory(), rounds=400)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
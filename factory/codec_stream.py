@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Streaming, chunked encode pipeline on top of the codec factory.
+
+The factory gives us a matching (audio, video) codec pair, the pipeline feeds
+both of them with a stream of memoryview chunks. Every track runs in its own
+worker threads (read -> encode -> write) connected by bounded queues, so a slow
+stage applies back pressure instead of buffering the whole media in memory.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from factory.video_audio_codec_factory import (
+    AudioCodec,
+    Chunk,
+    CodecFactory,
+    CompressedlessCodecFactory,
+    LosslessCodecFactory,
+    VideoCodec,
+)
+
+Sink = Callable[[str, Chunk], None]
+
+_DONE = object()
+
+
+class _Failure:
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class _UpstreamFailure(Exception):
+    """An earlier stage failed, its queue has already ended."""
+
+    def __init__(self, error: BaseException) -> None:
+        super().__init__(error)
+        self.error = error
+
+
+def chunked(buffer, chunk_size: int) -> Iterator[memoryview]:
+    """Slice a bytes-like object into memoryview chunks without copying."""
+    view = memoryview(buffer).cast('B')
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def chunks_of(source, chunk_size: int) -> Iterator[memoryview]:
+    """Chunks of a bytes-like source, or the buffers of an iterable as they come."""
+    try:
+        memoryview(source)
+    except TypeError:
+        return (memoryview(buffer) for buffer in source)
+    return chunked(source, chunk_size)
+
+
+def _produce(items: Iterable, out: queue.Queue, upstream: queue.Queue = None) -> None:
+    try:
+        for item in items:
+            out.put(item)
+        out.put(_DONE)
+    except _UpstreamFailure as err:
+        out.put(_Failure(err.error))
+    except BaseException as err:  # pylint: disable=broad-except
+        out.put(_Failure(err))
+        if upstream is not None:
+            _discard(upstream)
+
+
+def _discard(source: queue.Queue) -> None:
+    """Unblock the upstream stage after a failure."""
+    while True:
+        item = source.get()
+        if item is _DONE or isinstance(item, _Failure):
+            return
+
+
+def _consume(source: queue.Queue) -> Iterator:
+    while True:
+        item = source.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise _UpstreamFailure(item.error)
+        yield item
+
+
+class TrackStats:
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.chunks = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self.error: Optional[BaseException] = None
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_in / self.seconds / 1e6 if self.seconds else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f'TrackStats({self.name!r}, chunks={self.chunks}, bytes_in={self.bytes_in}, '
+            f'bytes_out={self.bytes_out}, {self.mb_per_second:.1f} MB/s)'
+        )
+
+
+class StreamPipeline:
+    """Encode the audio and video track of a CodecFactory concurrently."""
+
+    def __init__(self, factory: CodecFactory, chunk_size: int = 64 * 1024, queue_size: int = 8) -> None:
+        self.factory = factory
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+
+    def _codecs(self) -> Dict[str, object]:
+        # make() pairs are not ordered consistently, so pick them by interface
+        codecs = self.factory.make()
+        return {
+            'audio': next(codec for codec in codecs if isinstance(codec, AudioCodec)),
+            'video': next(codec for codec in codecs if isinstance(codec, VideoCodec)),
+        }
+
+    def _track(self, stats: TrackStats, codec, source, sink: Sink) -> list:
+        raw = queue.Queue(self.queue_size)
+        encoded = queue.Queue(self.queue_size)
+
+        def read() -> Iterator[memoryview]:
+            for chunk in chunks_of(source, self.chunk_size):
+                stats.chunks += 1
+                stats.bytes_in += len(chunk)
+                yield chunk
+
+        def write() -> None:
+            while True:
+                item = encoded.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    stats.error = item.error
+                    return
+                if stats.error is not None:
+                    continue    # keep draining, so upstream never blocks forever
+                try:
+                    stats.bytes_out += len(item)
+                    sink(stats.name, item)
+                except BaseException as err:  # pylint: disable=broad-except
+                    stats.error = err
+
+        return [
+            threading.Thread(target=_produce, args=(read(), raw), daemon=True),
+            threading.Thread(target=_produce, args=(codec.encode_stream(_consume(raw)), encoded, raw), daemon=True),
+            threading.Thread(target=write, daemon=True),
+        ]
+
+    def run(self, audio, video, sink: Sink = None) -> Dict[str, TrackStats]:
+        """Encode both tracks, pass the encoded chunks to sink(track, chunk).
+
+        A track is a bytes-like object, split into chunk_size chunks, or an
+        iterable of bytes-like chunks, e.g. read from a file as it goes.
+        """
+        sink = sink if sink is not None else (lambda track, chunk: None)
+        codecs = self._codecs()
+        stats = {name: TrackStats(name) for name in codecs}
+        workers = self._track(stats['audio'], codecs['audio'], audio, sink)
+        workers += self._track(stats['video'], codecs['video'], video, sink)
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        for track in stats.values():
+            track.seconds = time.perf_counter() - start
+            if track.error is not None:
+                raise track.error
+        return stats
+
+
+def synthetic_media(size: int) -> bytes:
+    """Repeated blocks of random and patterned bytes, cheap to build at any size."""
+    block = os.urandom(4096) + bytes(range(256)) * 16
+    return block * (size // len(block))
+
+
+def benchmark(size: int = 64 * 1024 * 1024) -> None:
+    audio = synthetic_media(size // 4)
+    video = synthetic_media(size)
+    for factory in (LosslessCodecFactory(), CompressedlessCodecFactory()):
+        for chunk_size in (16 * 1024, 256 * 1024):
+            pipeline = StreamPipeline(factory, chunk_size=chunk_size)
+            start = time.perf_counter()
+            stats = pipeline.run(audio, video)
+            seconds = time.perf_counter() - start
+            total = stats['audio'].bytes_in + stats['video'].bytes_in
+            print(
+                f'{type(factory).__name__:28} chunk={chunk_size // 1024:4} KiB '
+                f'{total / seconds / 1e6:10.1f} MB/s '
+                f'(ratio {(stats["audio"].bytes_out + stats["video"].bytes_out) / total:.2f})'
+            )
+
+
+def main() -> int:
+    pipeline = StreamPipeline(CompressedlessCodecFactory(), chunk_size=1024)
+    encoded = []
+    pipeline.run(b'a' * 4096, b'v' * 8192, sink=lambda track, chunk: encoded.append((track, bytes(chunk))))
+    print(f'Encoded {len(encoded)} chunks')
+
+    benchmark()
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -85,6 +85,10 @@ class PizzaFactory(ABC):
     Subclasses decide which class to instantiate.
     """
 
+    @abstractmethod
+    def order(self) -> Pizza:
+        """Abstract method to instantiate a specific pizza type."""
+
     @abstractmethod
     def create(self):
         """Abstract method to create a specific pizza type."""
@@ -93,9 +97,13 @@ class PizzaFactory(ABC):
 class CheesePizzaFactory(PizzaFactory):
     """Factory subclass instantiating the CheesePizza class."""
 
+    def order(self) -> CheesePizza:
+        """Instantiate the cheese pizza, nothing is prepared yet."""
+        return CheesePizza()
+
     def create(self) -> CheesePizza:
         """Create the cheese pizza."""
-        pizza = CheesePizza()
+        pizza = self.order()
         pizza.prepare()
         pizza.bake()
         pizza.cut()
@@ -106,9 +114,13 @@ class CheesePizzaFactory(PizzaFactory):
 class HawaiPizzaFactory(PizzaFactory):
     """Factory subclass instantiating the HawaiPizza class."""
 
+    def order(self) -> HawaiPizza:
+        """Instantiate the hawai pizza, nothing is prepared yet."""
+        return HawaiPizza()
+
     def create(self) -> HawaiPizza:
         """Create the hawai pizza."""
-        pizza = HawaiPizza()
+        pizza = self.order()
         pizza.prepare()
         pizza.bake()
         pizza.cut()
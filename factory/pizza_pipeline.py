@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Pipelined batch production line for the pizza factories.
+
+PizzaFactory.create() runs prepare -> bake -> cut -> box for one pizza at a
+time and order_pizza() waits for the user. On a production line every step is
+a station with its own workers and a bounded queue in front of it, so while
+one pizza is baking the next one is already being prepared.
+
+Usage:
+    python -m factory.pizza_pipeline [ORDER ...]     orders are '1'/'cheese' or '2'/'hawai'
+"""
+
+import argparse
+import queue
+import statistics
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from factory.pizza_factory import CheesePizzaFactory, HawaiPizzaFactory, Pizza, PizzaFactory
+
+STEPS = ('prepare', 'bake', 'cut', 'box')
+
+MENU: Dict[str, PizzaFactory] = {
+    '1': CheesePizzaFactory(),
+    'cheese': CheesePizzaFactory(),
+    '2': HawaiPizzaFactory(),
+    'hawai': HawaiPizzaFactory(),
+}
+
+Work = Callable[[Pizza, str], None]
+
+_CLOSED = object()
+
+
+def run_step(pizza: Pizza, step: str) -> None:
+    getattr(pizza, step)()
+
+
+class Order:
+
+    def __init__(self, number: int, factory: PizzaFactory) -> None:
+        self.number = number
+        self.pizza = factory.order()
+        self.ordered_at = time.perf_counter()
+        self.done_at = 0.0
+        self.error: Optional[BaseException] = None
+
+    @property
+    def latency(self) -> float:
+        return self.done_at - self.ordered_at
+
+
+class Stage:
+    """One station of the line - a worker pool in front of a bounded queue."""
+
+    def __init__(self, step: str, workers: int, queue_size: int) -> None:
+        self.step = step
+        self.workers = workers
+        self.inbox: queue.Queue = queue.Queue(queue_size)
+        self.busy = 0.0
+        self.processed = 0
+        self._lock = threading.Lock()
+
+    def utilization(self, wall_time: float) -> float:
+        return self.busy / (self.workers * wall_time) if wall_time else 0.0
+
+    def serve(self, work: Work, outbox: queue.Queue, last: bool = False) -> None:
+        while True:
+            order = self.inbox.get()
+            if order is _CLOSED:
+                self.inbox.put(_CLOSED)     # let the other workers of the stage stop too
+                return
+            if order.error is not None:
+                if last:
+                    order.done_at = time.perf_counter()
+                outbox.put(order)       # a failed order skips the rest of the line
+                continue
+            start = time.perf_counter()
+            try:
+                work(order.pizza, self.step)
+            except Exception as err:  # pylint: disable=broad-except
+                order.error = err
+            spent = time.perf_counter() - start
+            with self._lock:
+                self.busy += spent
+                self.processed += 1
+            if last:
+                # stamped here, run() collects the orders only after feeding them all
+                order.done_at = time.perf_counter()
+            outbox.put(order)
+
+
+class PizzaPipeline:
+
+    def __init__(self, workers: Dict[str, int] = None, queue_size: int = 16, work: Work = run_step) -> None:
+        workers = workers or {}
+        self.stages = [Stage(step, workers.get(step, 1), queue_size) for step in STEPS]
+        self.work = work
+        self.wall_time = 0.0
+
+    def run(self, factories: Sequence[PizzaFactory]) -> List[Order]:
+        """Make all the orders, the first failed one is raised once the line stops."""
+        done: queue.Queue = queue.Queue()
+        outboxes = [stage.inbox for stage in self.stages[1:]] + [done]
+        threads = [
+            threading.Thread(target=stage.serve, args=(self.work, outbox, outbox is done), daemon=True)
+            for stage, outbox in zip(self.stages, outboxes)
+            for _ in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        start = time.perf_counter()
+        orders = []
+        feed_errors = []
+
+        def feed() -> None:
+            try:
+                for number, factory in enumerate(factories, 1):
+                    order = Order(number, factory)
+                    orders.append(order)
+                    self.stages[0].inbox.put(order)
+            except Exception as err:  # pylint: disable=broad-except
+                feed_errors.append(err)
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+        finished = 0
+        feeder.join()
+        while finished < len(orders):
+            done.get()
+            finished += 1
+        self.wall_time = time.perf_counter() - start
+
+        for stage in self.stages:
+            stage.inbox.put(_CLOSED)
+        for thread in threads:
+            thread.join()
+        errors = feed_errors + [order.error for order in orders if order.error is not None]
+        if errors:
+            raise errors[0]
+        return orders
+
+    def report(self, orders: List[Order]) -> str:
+        if not orders:
+            return '0 pizzas'
+        latencies = sorted(order.latency * 1000 for order in orders)
+        percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        lines = [
+            f'{len(orders)} pizzas in {self.wall_time:.2f} s '
+            f'({len(orders) / self.wall_time:.1f} pizzas/s)',
+            f'latency ms: p50={percentiles[49]:.1f} p90={percentiles[89]:.1f} '
+            f'p99={percentiles[98]:.1f} max={latencies[-1]:.1f}',
+        ]
+        for stage in self.stages:
+            lines.append(
+                f'  {stage.step:8} workers={stage.workers} '
+                f'utilization={stage.utilization(self.wall_time):6.1%}'
+            )
+        return '\n'.join(lines)
+
+
+# Simulation - every step takes some time, baking takes the longest.
+STEP_TIME = {'prepare': 0.002, 'bake': 0.008, 'cut': 0.001, 'box': 0.001}
+
+
+def simulate_step(pizza: Pizza, step: str) -> None:
+    # pylint: disable=unused-argument
+    time.sleep(STEP_TIME[step])
+
+
+def benchmark(count: int = 200) -> None:
+    factories = [MENU['1'], MENU['2']] * (count // 2)
+
+    start = time.perf_counter()
+    for factory in factories:
+        # the same work as create(), only simulated
+        pizza = factory.order()
+        for step in STEPS:
+            simulate_step(pizza, step)
+    serial = time.perf_counter() - start
+    print(f'serial create(): {count} pizzas in {serial:.2f} s ({count / serial:.1f} pizzas/s)')
+
+    # size the stations after the step times, the oven is the bottleneck
+    pipeline = PizzaPipeline(workers={'prepare': 1, 'bake': 4, 'cut': 1, 'box': 1}, work=simulate_step)
+    orders = pipeline.run(factories)
+    print(pipeline.report(orders))
+    print(f'speedup: {serial / pipeline.wall_time:.1f}x')
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Pipelined batch of pizza orders.')
+    parser.add_argument('orders', nargs='*', metavar='ORDER')
+    parser.add_argument('--benchmark', type=int, metavar='COUNT', default=0)
+    args = parser.parse_args(argv)
+    for order in args.orders:
+        if order not in MENU:
+            parser.error(f'{order!r} is not a valid option!')
+
+    if args.orders:
+        pipeline = PizzaPipeline()
+        print(pipeline.report(pipeline.run([MENU[order] for order in args.orders])))
+    if args.benchmark or not args.orders:
+        benchmark(args.benchmark or 200)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
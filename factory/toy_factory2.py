@@ -36,18 +36,21 @@ class ToyFactory(ABC):
         ...
 
 
+# Molds are stateless, every factory reuses a single one.
 class DuckToy(ToyFactory):
 
+    mold = DuckMold()
+
     def create(self, name: str) -> None:
-        duckmold = DuckMold()
-        duckmold.inject(name)
+        self.mold.inject(name)
 
 
 class CarToy(ToyFactory):
 
+    mold = CarMold()
+
     def create(self, name: str) -> None:
-        duckmold = DuckMold()
-        duckmold.inject(name)
+        self.mold.inject(name)
 
 
 def main() -> int:
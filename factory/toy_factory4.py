@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""Factory pattern.
+
+The factory pattern defines an interface for creating an object, but let's
+subclasses decide which class to instantiate.
+Factory methods let a class defer instantiation to subclasses.
+
+This version is meant for mass production:
+- molds are stateless, so every mold class has exactly one instance,
+- the name -> mold dispatch table is case folded and built once,
+- create_many() looks the mold up once per distinct name, not once per toy.
+"""
+
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence
+
+
+class Mold(ABC):
+    """Stateless mold, one shared instance per mold class."""
+
+    def __new__(cls):
+        instance = cls.__dict__.get('_instance')
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    @abstractmethod
+    def inject(self, name: str) -> str:
+        ...
+
+    def inject_many(self, names: Sequence[str]) -> List[str]:
+        inject = self.inject
+        return [inject(name) for name in names]
+
+
+class DuckMold(Mold):
+
+    def inject(self, name: str) -> str:
+        return f'Making {name} from duck mold'
+
+    def inject_many(self, names: Sequence[str]) -> List[str]:
+        return [f'Making {name} from duck mold' for name in names]
+
+
+class CarMold(Mold):
+
+    def inject(self, name: str) -> str:
+        return f'Making {name} from car mold'
+
+    def inject_many(self, names: Sequence[str]) -> List[str]:
+        return [f'Making {name} from car mold' for name in names]
+
+
+class ToyFactory:
+    """Dispatch toy names to their molds."""
+
+    # exact spellings already looked up, e.g. 'Duck' and 'DUCK' of 'duck'
+    max_aliases = 1024
+
+    def __init__(self, molds: Dict[str, Mold]) -> None:
+        self._dispatch: Dict[str, Mold] = {}
+        self._aliases: Dict[str, Mold] = {}
+        for name, mold in molds.items():
+            self.register(name, mold)
+
+    def register(self, name: str, mold: Mold) -> None:
+        self._dispatch[sys.intern(name.casefold())] = mold
+        # a remembered spelling may point to the replaced mold
+        self._aliases.clear()
+
+    def mold(self, name: str) -> Mold:
+        try:
+            return self._aliases[name]
+        except KeyError:
+            pass
+        try:
+            mold = self._dispatch[name.casefold()]
+        except KeyError:
+            raise AssertionError(f"I don't know how to make {name!r}") from None
+        if len(self._aliases) < self.max_aliases:
+            # next time the same spelling is found without case folding
+            self._aliases[sys.intern(name)] = mold
+        return mold
+
+    def create(self, name: str) -> str:
+        return self.mold(name).inject(name)
+
+    def create_many(self, names: Sequence[str]) -> List[str]:
+        """Create toys in bulk, the result keeps the order of names.
+
+        Every distinct name is dispatched and grouped by its mold once, each
+        mold then injects its whole group in one call.
+        """
+        groups: Dict[Mold, List[str]] = {}
+        for name in dict.fromkeys(names):
+            groups.setdefault(self.mold(name), []).append(name)
+
+        toys: Dict[str, str] = {}
+        for mold, group in groups.items():
+            toys.update(zip(group, mold.inject_many(group)))
+        return list(map(toys.__getitem__, names))
+
+
+toy_factory = ToyFactory({'duck': DuckMold(), 'car': CarMold()})
+
+
+def create_toy(name: str) -> str:
+    """Factory function."""
+    return toy_factory.create(name)
+
+
+def benchmark(count: int = 1_000_000) -> None:
+    names = ['duck', 'Car', 'DUCK', 'car'] * (count // 4)
+
+    def if_chain(name: str) -> str:
+        # the toy_factory3.create_toy() way, a new mold for every toy
+        if name.lower() == 'duck':
+            return object.__new__(DuckMold).inject(name)
+        if name.lower() == 'car':
+            return object.__new__(CarMold).inject(name)
+        raise AssertionError(f"I don't know how to make {name!r}")
+
+    for label, run in (
+        ('if chain, new mold', lambda: [if_chain(name) for name in names]),
+        ('dispatch table', lambda: [create_toy(name) for name in names]),
+        ('create_many()', lambda: toy_factory.create_many(names)),
+    ):
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        print(f'{label:20} {seconds / len(names) * 1e9:8.1f} ns/toy')
+
+
+def main() -> None:
+    print(create_toy('duck'))
+    print(create_toy('car'))
+    print(*toy_factory.create_many(['Duck', 'car', 'duck']), sep='\n')
+    assert DuckMold() is DuckMold()
+
+    benchmark()
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Batch transcoding over the codec factory families.
+
+ask_user() picks one factory and encodes one media interactively. For batch
+use the scheduler takes many (input, factory) jobs, splits every track into
+chunk sized tasks and spreads them over a process pool. Results are put back
+together in the original chunk order per track, while progress and latency
+are reported per job.
+
+Every chunk is encoded as an independent segment (e.g. a zlib stream of its
+own), so the output of a track is the list of its segments. output() frames
+them into one buffer, each segment with a 4 byte big-endian length before it,
+split_segments() reads them back.
+
+Usage:
+    python -m factory.transcode_scheduler [--family lossless|compressed|both] [FILE ...]
+"""
+
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from factory.video_audio_codec_factory import (
+    AudioCodec,
+    CodecFactory,
+    CompressedlessCodecFactory,
+    LosslessCodecFactory,
+    VideoCodec,
+)
+
+FAMILIES: Dict[str, Type[CodecFactory]] = {
+    'lossless': LosslessCodecFactory,
+    'compressed': CompressedlessCodecFactory,
+}
+
+TRACKS = ('audio', 'video')
+SEGMENT_LENGTH = struct.Struct('>I')
+
+# every worker process builds the codecs of a family only once
+_worker_codecs: Dict[Type[CodecFactory], Dict[str, object]] = {}
+
+
+def _codecs_for(factory_type: Type[CodecFactory]) -> Dict[str, object]:
+    codecs = _worker_codecs.get(factory_type)
+    if codecs is None:
+        pair = factory_type().make()
+        codecs = _worker_codecs[factory_type] = {
+            'audio': next(codec for codec in pair if isinstance(codec, AudioCodec)),
+            'video': next(codec for codec in pair if isinstance(codec, VideoCodec)),
+        }
+    return codecs
+
+
+def encode_chunk(factory_type: Type[CodecFactory], track: str, chunk: bytes) -> bytes:
+    """Worker task - every chunk is encoded as an independent segment."""
+    codec = _codecs_for(factory_type)[track]
+    return b''.join(codec.encode_stream([memoryview(chunk)]))
+
+
+def split_segments(data: bytes) -> Iterator[bytes]:
+    """The segments of a TranscodeJob.output() buffer."""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        (length,) = SEGMENT_LENGTH.unpack_from(view, offset)
+        offset += SEGMENT_LENGTH.size
+        if offset + length > len(view):
+            raise ValueError(f'Truncated segment at offset {offset - SEGMENT_LENGTH.size}')
+        yield bytes(view[offset:offset + length])
+        offset += length
+
+
+class TranscodeJob:
+
+    def __init__(self, name: str, audio: bytes, video: bytes, factory: CodecFactory) -> None:
+        self.name = name
+        self.inputs = {'audio': audio, 'video': video}
+        self.factory = factory
+        self.outputs: Dict[str, List[bytes]] = {track: [] for track in TRACKS}
+        self.total = 0
+        self.done = 0
+        self.submitted_at = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def latency(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.submitted_at
+
+    def segments(self, track: str) -> List[bytes]:
+        """Encoded chunks of the track in order, each decodes on its own."""
+        return list(self.outputs[track])
+
+    def output(self, track: str) -> bytes:
+        """All the segments of the track, length-prefixed."""
+        return b''.join(
+            part for segment in self.outputs[track] for part in (SEGMENT_LENGTH.pack(len(segment)), segment)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f'TranscodeJob({self.name!r}, {type(self.factory).__name__}, '
+            f'{self.done}/{self.total} chunks, latency={self.latency * 1000:.1f} ms)'
+        )
+
+
+class _TrackReorder:
+    """Collect out of order chunk results and release them in sequence."""
+
+    def __init__(self, out: List[bytes]) -> None:
+        self.out = out
+        self.next_seq = 0
+        self.pending: Dict[int, bytes] = {}
+
+    def put(self, seq: int, data: bytes) -> None:
+        self.pending[seq] = data
+        while self.next_seq in self.pending:
+            self.out.append(self.pending.pop(self.next_seq))
+            self.next_seq += 1
+
+
+Progress = Callable[[TranscodeJob], None]
+
+
+class TranscodeScheduler:
+    """Split jobs into chunk tasks and run them on a process pool."""
+
+    def __init__(self, workers: int = None, chunk_size: int = 1024 * 1024, max_in_flight: int = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # bounded number of submitted tasks keeps the memory usage flat
+        self.max_in_flight = max_in_flight or self.workers * 4
+
+    def _chunks(self, job: TranscodeJob, track: str) -> Iterator[Tuple[TranscodeJob, str, int, bytes]]:
+        data = memoryview(job.inputs[track])
+        for seq, start in enumerate(range(0, len(data), self.chunk_size)):
+            # the only copy - chunks have to be pickled for the worker anyway
+            yield job, track, seq, bytes(data[start:start + self.chunk_size])
+
+    def _tasks(self, jobs: List[TranscodeJob]) -> Iterator[Tuple[TranscodeJob, str, int, bytes]]:
+        """Interleave the chunks of all jobs, so short jobs don't wait behind long ones."""
+        streams = [self._chunks(job, track) for job in jobs for track in TRACKS]
+        while streams:
+            for stream in list(streams):
+                task = next(stream, None)
+                if task is None:
+                    streams.remove(stream)
+                else:
+                    yield task
+
+    def run(self, jobs: List[TranscodeJob], on_progress: Progress = None) -> List[TranscodeJob]:
+        reorders = {(job, track): _TrackReorder(job.outputs[track]) for job in jobs for track in TRACKS}
+        tasks = self._tasks(jobs)
+        in_flight: Dict[Future, Tuple[TranscodeJob, str, int]] = {}
+        start = time.perf_counter()
+        for job in jobs:
+            job.submitted_at = start
+            job.total = sum(-(-len(job.inputs[track]) // self.chunk_size) for track in TRACKS)
+
+        with ProcessPoolExecutor(self.workers) as pool:
+            exhausted = False
+            while in_flight or not exhausted:
+                while not exhausted and len(in_flight) < self.max_in_flight:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    job, track, seq, chunk = task
+                    if job.started_at is None:
+                        job.started_at = time.perf_counter()
+                    future = pool.submit(encode_chunk, type(job.factory), track, chunk)
+                    in_flight[future] = (job, track, seq)
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job, track, seq = in_flight.pop(future)
+                    reorders[job, track].put(seq, future.result())
+                    job.done += 1
+                    if job.done == job.total:
+                        job.finished_at = time.perf_counter()
+                    if on_progress is not None:
+                        on_progress(job)
+
+        for job in jobs:
+            if job.finished_at is None:     # empty input
+                job.finished_at = time.perf_counter()
+        return jobs
+
+
+def print_progress(job: TranscodeJob) -> None:
+    if job.done == job.total or job.done % 16 == 0:
+        print(f'{job.name}: {job.done}/{job.total}')
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Batch transcode media files.')
+    parser.add_argument('--family', choices=[*FAMILIES, 'both'], default='both')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args(argv)
+
+    if args.files:
+        inputs = {}
+        for path in args.files:
+            with open(path, mode='rb') as fh:
+                inputs[path] = fh.read()
+    else:
+        block = os.urandom(1024) * 64
+        inputs = {f'synthetic{i}': block * (4 + i) for i in range(8)}
+
+    families = FAMILIES if args.family == 'both' else {args.family: FAMILIES[args.family]}
+    jobs = [
+        # the same input is used for both tracks, a real demuxer would split them
+        TranscodeJob(f'{name} [{family}]', data, data, factory())
+        for name, data in inputs.items()
+        for family, factory in families.items()
+    ]
+
+    start = time.perf_counter()
+    TranscodeScheduler(workers=args.workers).run(jobs, on_progress=print_progress)
+    seconds = time.perf_counter() - start
+
+    total = sum(len(job.inputs[track]) for job in jobs for track in TRACKS)
+    for job in jobs:
+        print(job)
+    print(f'{len(jobs)} jobs, {total / seconds / 1e6:.1f} MB/s')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
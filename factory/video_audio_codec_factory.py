@@ -9,8 +9,11 @@ subclasses decide which class to instantiate.
 Factory methods let a class defer instantiation to subclasses.
 """
 
+import zlib
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Iterable, Iterator, Tuple, Union
+
+Chunk = Union[bytes, memoryview]
 
 
 class AudioCodec(ABC):
@@ -20,6 +23,14 @@ class AudioCodec(ABC):
     def encode(self):
         """Abstract method to enconde an audio stream."""
 
+    def encode_stream(self, chunks: Iterable[memoryview]) -> Iterator[Chunk]:
+        """Encode an audio stream chunk by chunk.
+
+        Lossless codecs don't need to touch the data, the chunks are passed
+        through without any copy.
+        """
+        yield from chunks
+
 
 class VideoCodec(ABC):
     """Abstract class to encode video stream."""
@@ -28,6 +39,20 @@ class VideoCodec(ABC):
     def encode(self):
         """Abstract method to enconde an audio stream."""
 
+    def encode_stream(self, chunks: Iterable[memoryview]) -> Iterator[Chunk]:
+        """Encode a video stream chunk by chunk."""
+        yield from chunks
+
+
+def compress_stream(chunks: Iterable[memoryview], level: int) -> Iterator[bytes]:
+    """Compress chunks incrementally, zlib reads the memoryviews directly."""
+    compressor = zlib.compressobj(level)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
 
 class CodecFactory(ABC):
     """
@@ -57,6 +82,10 @@ class AACAudioCodec(AudioCodec):
         """Encode AAC audio."""
         print('Encoding audio to AAC')
 
+    def encode_stream(self, chunks: Iterable[memoryview]) -> Iterator[bytes]:
+        """Encode AAC audio stream."""
+        return compress_stream(chunks, level=1)
+
 
 class MP4AudioCodec(VideoCodec):
     """MP4 Video Codec class."""
@@ -65,6 +94,10 @@ class MP4AudioCodec(VideoCodec):
         """Encode MP4 video."""
         print('Encoding video to MP4')
 
+    def encode_stream(self, chunks: Iterable[memoryview]) -> Iterator[bytes]:
+        """Encode MP4 video stream."""
+        return compress_stream(chunks, level=1)
+
 
 class AVIAudioCodec(VideoCodec):
     """AVI Video Codec class."""
@@ -0,0 +1 @@
+"""Flyweight pattern example."""
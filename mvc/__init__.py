@@ -0,0 +1 @@
+"""Model-View-Controller examples."""
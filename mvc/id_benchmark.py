@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+"""Compare the single shot ID strategies with their batch variants."""
+
+import time
+from typing import Callable
+
+from mvc.mvc_with_strategy import (
+    batch_strategies,
+    generate_name,
+    generate_simple_string,
+    generate_uuid1,
+    generate_uuid4,
+)
+
+
+def rate(run: Callable[[], list], n: int, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ids = run()
+        best = min(best, time.perf_counter() - start)
+        assert len(ids) == n
+    return n / best
+
+
+def main() -> int:
+    n = 200_000
+    print(f'{"strategy":24} {"single/s":>14} {"batch/s":>14}')
+    for strategy in (generate_uuid1, generate_uuid4, generate_simple_string, generate_name):
+        single = rate(lambda: [strategy() for _ in range(n)], n)
+        batch = rate(lambda: batch_strategies[strategy](n), n)
+        print(f'{strategy.__name__:24} {single:14,.0f} {batch:14,.0f}  {batch / single:5.1f}x')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""Headless ID generator service around the UUID app strategies.
+
+In the Tk app a strategy runs on the main thread, once per click. The service
+runs the chosen strategy (looked up in the `buttons` registry) in worker
+threads or processes. Every worker fills its own bounded queue with batches of
+IDs ahead of time and every consumer thread keeps its own partly used batch,
+so take(n) never contends on one global lock.
+
+Usage:
+    python -m mvc.id_service [BUTTON] [--workers N] [--processes]
+"""
+
+import argparse
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from mvc.mvc_with_strategy import buttons, generate_many, set_uuid1_clock_seq
+
+
+def _fill(button_name: str, batch_size: int, out, stop, clock_seq: Optional[int] = None) -> None:
+    """Worker loop - keep the worker's own queue full of batches."""
+    if clock_seq is not None:
+        set_uuid1_clock_seq(clock_seq)
+    strategy = buttons[button_name]
+    while not stop.is_set():
+        batch = generate_many(strategy, batch_size)
+        while not stop.is_set():
+            try:
+                out.put(batch, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+
+class IdService:
+    """Pre-generated IDs of one strategy, served in batches."""
+
+    def __init__(
+        self,
+        button_name: str,
+        workers: int = 2,
+        batch_size: int = 4096,
+        depth: int = 4,
+        processes: bool = False,
+        ) -> None:
+        if button_name not in buttons:
+            raise KeyError(f'Unknown strategy {button_name!r}, use one of {list(buttons)}')
+        self.button_name = button_name
+        self.batch_size = batch_size
+        if processes:
+            if workers > 1 << 14:
+                raise ValueError(f'At most {1 << 14} worker processes, one UUID1 clock sequence each')
+            self._stop = multiprocessing.Event()
+            self._queues = [multiprocessing.Queue(depth) for _ in range(workers)]
+            worker_class = multiprocessing.Process
+            # UUID1 timestamps are unique per process only, so every process
+            # gets a clock sequence of its own and their UUIDs never collide
+            first = random.getrandbits(14)
+            clock_seqs = [(first + number) % (1 << 14) for number in range(workers)]
+        else:
+            self._stop = threading.Event()
+            self._queues = [queue.Queue(depth) for _ in range(workers)]
+            worker_class = threading.Thread
+            clock_seqs = [None] * workers
+        self._workers = [
+            worker_class(target=_fill, args=(button_name, batch_size, out, self._stop, clock_seq), daemon=True)
+            for out, clock_seq in zip(self._queues, clock_seqs)
+        ]
+        self._local = threading.local()
+        self._latencies: deque = deque(maxlen=10_000)
+        self._taken: List[List[int]] = []    # one counter per consumer thread
+        self._started = 0.0
+
+    def start(self) -> 'IdService':
+        self._started = time.perf_counter()
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout=1)
+            if isinstance(worker, multiprocessing.Process) and worker.is_alive():
+                worker.terminate()
+
+    def __enter__(self) -> 'IdService':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _next_batch(self, local) -> list:
+        # try all workers without blocking, starting with this consumer's one
+        count = len(self._queues)
+        for offset in range(count):
+            index = (local.cursor + offset) % count
+            try:
+                batch = self._queues[index].get_nowait()
+            except queue.Empty:
+                continue
+            local.cursor = (index + 1) % count
+            return batch
+        while True:
+            if self._stop.is_set():
+                raise RuntimeError('The service is closed')
+            try:
+                return self._queues[local.cursor].get(timeout=0.1)
+            except queue.Empty:
+                local.cursor = (local.cursor + 1) % count
+
+    def take(self, n: int) -> List:
+        """Take n IDs, they are never handed out twice."""
+        start = time.perf_counter()
+        local = self._local
+        if not hasattr(local, 'batch'):
+            local.batch, local.position = [], 0
+            local.cursor = threading.get_ident() % len(self._queues)
+            local.taken = [0]
+            self._taken.append(local.taken)
+
+        ids: List = []
+        while len(ids) < n:
+            if local.position >= len(local.batch):
+                local.batch, local.position = self._next_batch(local), 0
+            end = local.position + n - len(ids)
+            ids.extend(local.batch[local.position:end])
+            local.position = min(end, len(local.batch))
+
+        self._latencies.append(time.perf_counter() - start)
+        local.taken[0] += n
+        return ids
+
+    def metrics(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        latencies = sorted(self._latencies)
+        taken = sum(counter[0] for counter in self._taken)
+        return {
+            'taken': taken,
+            'ids_per_second': taken / elapsed if elapsed else 0.0,
+            'p50_us': latencies[len(latencies) // 2] * 1e6 if latencies else 0.0,
+            'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6 if latencies else 0.0,
+        }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Serve IDs from background workers.')
+    parser.add_argument('button', nargs='?', default='Generate UUID4', choices=list(buttons))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--consumers', type=int, default=4)
+    parser.add_argument('--processes', action='store_true')
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    with IdService(args.button, workers=args.workers, processes=args.processes) as service:
+        print(service.take(3))
+        deadline = time.perf_counter() + args.seconds
+
+        def consume() -> None:
+            while time.perf_counter() < deadline:
+                service.take(1000)
+
+        consumers = [threading.Thread(target=consume) for _ in range(args.consumers)]
+        for consumer in consumers:
+            consumer.start()
+        for consumer in consumers:
+            consumer.join()
+        print(service.metrics())
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
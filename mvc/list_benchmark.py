@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""Headless benchmark of appending generated IDs to the list view.
+
+No display (or Xvfb) is needed - the views get a fake root and a fake Listbox,
+which count the Tcl calls and the rows a real Listbox would have to hold.
+"""
+
+import time
+from typing import Callable
+
+from mvc.mvc_with_strategy import (
+    IdStore,
+    MyController,
+    Model,
+    TkView,
+    VirtualTkView,
+    buttons,
+)
+
+
+class FakeRoot:
+
+    def __init__(self) -> None:
+        self.timers = []
+
+    def after(self, ms, callback) -> None:
+        self.timers.append((time.perf_counter() + ms / 1000, callback))
+
+    def update(self, everything: bool = False) -> None:
+        """Run the due timers, like the main loop between two events."""
+        now = time.perf_counter()
+        due = [callback for when, callback in self.timers if everything or when <= now]
+        if due:
+            self.timers = [] if everything else [timer for timer in self.timers if timer[0] > now]
+            for callback in due:
+                callback()
+
+
+class FakeListbox:
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.calls = 0
+
+    def insert(self, index, *items) -> None:
+        # pylint: disable=unused-argument
+        self.calls += 1
+        self.rows += len(items)
+
+    def delete(self, first, last=None) -> None:
+        self.calls += 1
+        if last is None:
+            last = first
+        elif last == 'end':
+            last = self.rows - 1
+        self.rows -= max(0, min(last, self.rows - 1) - first + 1)
+
+
+class FakeScrollbar:
+
+    def set(self, first, last) -> None:
+        pass
+
+
+def fake_view(view: TkView) -> TkView:
+    view.root = FakeRoot()
+    view.list = FakeListbox()
+    view.scrollbar = FakeScrollbar()
+    return view
+
+
+def run(make_view: Callable[[IdStore], TkView], clicks: int, batch_size: int) -> None:
+    model = Model()
+    view = make_view(model.uuid)
+    controller = MyController(fake_view(view), model, buttons, batch_size=batch_size)
+    start = time.perf_counter()
+    for _ in range(clicks):
+        controller.handle_button('Generate Name')
+        # the main loop runs the due timers after every click
+        view.root.update()
+    view.root.update(everything=True)
+    seconds = time.perf_counter() - start
+    appended = clicks * batch_size
+    print(
+        f'{type(view).__name__:14} batch={batch_size:5} {appended:9,} rows '
+        f'{seconds / appended * 1e9:8.0f} ns/row  Tcl calls={view.list.calls:9,}  '
+        f'rows held by Listbox={view.list.rows:9,}'
+    )
+
+
+def main() -> int:
+    for total in (100_000, 1_000_000):
+        run(lambda items: TkView(), total, batch_size=1)
+        run(VirtualTkView, total, batch_size=1)
+        run(VirtualTkView, total // 1000, batch_size=1000)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
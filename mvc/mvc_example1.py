@@ -4,8 +4,11 @@
 
 from typing import Tuple, Union
 
+from mvc.quote_index import QuoteIndex
+from mvc.quote_store import QuoteStore
 
-# data here represent a simple database like object
+
+# data the quote store is seeded with
 quotes = [
     "It's not about ideas. It's about making ideas happen.",
     'Always deliver more than expected.',
@@ -18,6 +21,16 @@ quotes = [
 
 class Model:
 
+    def __init__(self, path: str = 'quotes.log') -> None:
+        # the database - append-only log with an in-memory index
+        self.store = QuoteStore(path)
+        if self.store.next_id == 1:
+            for quote in quotes:
+                self.store.add(quote)
+        # full-text search, kept up to date by add_quote and del_quote
+        self.index = QuoteIndex()
+        self.index.add_many((quote_id, self.store.get(quote_id)) for quote_id in self.store.ids())
+
     def validate_num(self, num: Union[str, int]) -> Tuple[int, str]:
         try:
             num = int(num)
@@ -27,8 +40,8 @@ class Model:
             return 1, '0 index is not supported'
         if num < 0:
             return 1, 'negative index is not supported'
-        if num > len(quotes):
-            return 1, f'max number is {len(quotes)}'
+        if num >= self.store.next_id:
+            return 1, f'max number is {self.store.next_id - 1}'
         return 0, 'OK'
 
     def get_quote(self, num: Union[str, int]) -> Tuple[int, str]:
@@ -36,30 +49,35 @@ class Model:
         code, msg = self.validate_num(num)
         if code != 0:
             return code, msg
-        try:
-            return 0, quotes[int(num) - 1]
-        except IndexError:
+        quote = self.store.get(int(num))
+        if quote is None:
             return 1, 'Not found'
+        return 0, quote
 
     def add_quote(self, quote: str) -> Tuple[int, str]:
         try:
-            quotes.append(quote)
+            quote_id = self.store.add(quote)
         except Exception as err:
             return 1, str(err)
+        self.index.add(quote_id, quote)
         return 0, 'OK'
 
     def del_quote(self, idx: Union[str, int]) -> Tuple[int, str]:
         code, msg = self.validate_num(idx)
         if code != 0:
             return code, msg
-        try:
-            del_quote = quotes.pop(int(idx) - 1)
-        except ValueError:
-            return 1, 'Invalid input'
-        except IndexError:
+        del_quote = self.store.delete(int(idx))
+        if del_quote is None:
             return 1, 'Not found'
+        self.index.remove(int(idx), del_quote)
         return 0, f'Quote {del_quote!r} deleted'
 
+    def search_quotes(self, query: str, limit: int = 10) -> Tuple[int, str]:
+        hits = self.index.search(query, limit)
+        if not hits:
+            return 1, 'Not found'
+        return 0, '\n'.join(f'{quote_id}: {self.store.get(quote_id)}' for quote_id, _ in hits)
+
 
 class View:
 
@@ -71,7 +89,8 @@ class View:
         1 - Select a quote
         2 - Add a new quote
         3 - Delete an already existing quote
-        4 - Exit: ''')
+        4 - Search quotes
+        5 - Exit: ''')
 
     @property
     def select_quote(self) -> str:
@@ -85,6 +104,10 @@ class View:
     def add_quote(self) -> str:
         return input('Please provide a quote to add: ')
 
+    @property
+    def search_quotes(self) -> str:
+        return input('Please provide words to search for: ')
+
     def show(self, quote: str) -> None:
         print(quote)
 
@@ -115,6 +138,8 @@ class Controller:
             elif user_choice == 3:
                 code, msg = self.model.del_quote(self.view.del_quote)
             elif user_choice == 4:
+                code, msg = self.model.search_quotes(self.view.search_quotes)
+            elif user_choice == 5:
                 self.view.show('Bye')
                 break
             else:
@@ -132,6 +157,7 @@ def main() -> int:
     model = Model()
     controller = Controller(view=view, model=model)
     controller.run()
+    model.store.close()
 
     return 0
 
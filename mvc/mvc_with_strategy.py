@@ -2,14 +2,147 @@
 
 import uuid
 from abc import ABC, abstractmethod
-import tkinter as tk
+import os
 import random
 import string
-from typing import Dict, Callable
+import struct
+import threading
+import time
+from typing import Dict, Callable, List, Optional, Union
+
+from patterns.lazy import lazy_import
+
+# the models and strategies work without Tk, the views import it on first use
+tk = lazy_import('tkinter')
+
+Value = Union[uuid.UUID, str]
+
+
+class IdStore:
+    # Generated values packed into fixed size slots of one bytearray instead
+    # of a list of Python objects. Every slot starts with a tag byte -
+    # UUID_TAG for a 16 byte UUID, otherwise the length of an UTF-8 string.
+    # With a capacity the slots form a ring and the oldest values are evicted.
+    # Strings longer than max_string are kept aside, their slot (LONG_TAG)
+    # only holds the key; the evicted ones are swept out now and then.
+
+    UUID_TAG = 0xff
+    LONG_TAG = 0xfe
+
+    def __init__(self, capacity: int = None, max_string: int = 31) -> None:
+        if capacity is not None and capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        if max_string >= self.LONG_TAG:
+            raise ValueError(f'max_string must be lower than {self.LONG_TAG}')
+        self.capacity = capacity
+        self.max_string = max_string
+        self.slot_size = 1 + max(16, max_string)
+        self._buffer = bytearray(self.slot_size * (capacity or 1024))
+        self._slots = capacity or 1024
+        self._head = 0      # slot of the oldest value
+        self._count = 0
+        self._long: Dict[int, str] = {}
+        self._long_key = 0
+        self._long_limit = 64
+        self.total = 0      # values appended since clear(), the evicted ones too
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _pack(self, value: Value) -> bytes:
+        if isinstance(value, uuid.UUID):
+            payload = value.bytes
+            return b'\xff' + payload + bytes(self.slot_size - 17)
+        payload = value.encode()
+        if len(payload) > self.max_string:
+            key = self._long_key
+            self._long_key += 1
+            self._long[key] = value
+            return b'\xfe' + key.to_bytes(8, 'little') + bytes(self.slot_size - 9)
+        return bytes((len(payload),)) + payload.ljust(self.slot_size - 1, b'\0')
+
+    def append(self, value: Value) -> None:
+        self._write(self._pack(value), 1)
+
+    def extend(self, values) -> None:
+        """Pack all the values first, then copy them with one or two slice writes."""
+        packed = b''.join(map(self._pack, values))
+        self._write(packed, len(packed) // self.slot_size)
+
+    def _write(self, packed: bytes, count: int) -> None:
+        self.total += count
+        if self.capacity is None:
+            # unbounded store is never rotated, so it simply doubles
+            while self._count + count > self._slots:
+                self._buffer.extend(bytes(len(self._buffer)))
+                self._slots *= 2
+        elif count >= self._slots:
+            # only the newest values fit
+            packed = packed[-self._slots * self.slot_size:]
+            self._head, self._count, count = 0, 0, self._slots
+        else:
+            evicted = max(0, self._count + count - self._slots)
+            self._head = (self._head + evicted) % self._slots
+            self._count -= evicted
+
+        first = (self._head + self._count) % self._slots
+        fits = min(count, self._slots - first)
+        start = first * self.slot_size
+        self._buffer[start:start + fits * self.slot_size] = packed[:fits * self.slot_size]
+        if fits < count:
+            # wrap around to the beginning of the ring
+            self._buffer[:(count - fits) * self.slot_size] = packed[fits * self.slot_size:]
+        self._count += count
+        if len(self._long) > self._long_limit:
+            self._sweep()
+
+    def _sweep(self) -> None:
+        """Forget the long strings whose slots were overwritten."""
+        live = {}
+        for index in range(self._count):
+            start = (self._head + index) % self._slots * self.slot_size
+            if self._buffer[start] == self.LONG_TAG:
+                key = int.from_bytes(self._buffer[start + 1:start + 9], 'little')
+                live[key] = self._long[key]
+        self._long = live
+        # sweep again only after the dead ones could double, amortized O(1)
+        self._long_limit = max(2 * len(live), 64)
+
+    def clear(self) -> None:
+        # the buffer is kept and reused
+        self._head = 0
+        self._count = 0
+        self.total = 0
+        self._long.clear()
+
+    def _get(self, index: int) -> Value:
+        start = (self._head + index) % self._slots * self.slot_size
+        tag = self._buffer[start]
+        if tag == self.UUID_TAG:
+            return uuid.UUID(bytes=bytes(self._buffer[start + 1:start + 17]))
+        if tag == self.LONG_TAG:
+            return self._long[int.from_bytes(self._buffer[start + 1:start + 9], 'little')]
+        return self._buffer[start + 1:start + 1 + tag].decode()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('IdStore index out of range')
+        return self._get(index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._get(index)
 
 
 class Model():
-    uuid = []
+
+    def __init__(self, capacity: int = None) -> None:
+        # every model has its own store of generated values
+        self.uuid = IdStore(capacity)
 
 
 class Controller(ABC):
@@ -39,6 +172,10 @@ class View(ABC):
     def append_to_list(self):
         pass
 
+    def append_many(self, items):
+        for item in items:
+            self.append_to_list(item)
+
     @abstractmethod
     def clear_list(self):
         pass
@@ -62,8 +199,7 @@ class TkView(View):
         self.frame.pack(fill=tk.BOTH, expand=1)
         self.label = tk.Label(self.frame, text='Result:')
         self.label.pack()
-        self.list = tk.Listbox(self.frame)
-        self.list.pack(fill=tk.BOTH, expand=1)
+        self.create_list()
         for button_name in controller.buttons:
             button_name_optimized = button_name.replace(' ', '')
             self.__setattr__(
@@ -83,6 +219,10 @@ class TkView(View):
         )
         self.clear_button.pack()
 
+    def create_list(self) -> None:
+        self.list = tk.Listbox(self.frame)
+        self.list.pack(fill=tk.BOTH, expand=1)
+
     # Interaction in the user interface
     def append_to_list(self, item):
         self.list.insert(tk.END, item)
@@ -96,6 +236,94 @@ class TkView(View):
         self.root.mainloop()
 
 
+class VirtualTkView(TkView):
+    # The Listbox holds only the visible rows, all the rows are read from the
+    # model's store (self.items), so the capacity of the model bounds the view.
+    # Appends just schedule one redraw for the next frame, so all the appends
+    # of a frame cost a single update of the Listbox.
+
+    def __init__(self, items: IdStore, frame_ms: int = 16) -> None:
+        self.items = items
+        self.frame_ms = frame_ms
+        self.first = 0
+        self.rows = 10
+        self.follow = True          # keep showing the newest rows
+        self._shown = (0, 0)        # rows held by the Listbox, counted like items.total
+        self._redraw_pending = False
+        self._line_height = 16
+
+    def create_list(self) -> None:
+        box = tk.Frame(self.frame)
+        box.pack(fill=tk.BOTH, expand=1)
+        self.scrollbar = tk.Scrollbar(box, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.list = tk.Listbox(box, activestyle='none')
+        self.list.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+        from tkinter import font
+        self._line_height = font.Font(font=self.list['font']).metrics('linespace') + 1
+        self.list.bind('<Configure>', self.resize)
+        self.list.bind('<MouseWheel>', lambda event: self.scroll('scroll', -event.delta // 120, 'units'))
+        self.list.bind('<Button-4>', lambda event: self.scroll('scroll', -1, 'units'))
+        self.list.bind('<Button-5>', lambda event: self.scroll('scroll', 1, 'units'))
+
+    # the controller has put the items into the model's store already
+    def append_to_list(self, item):
+        self.schedule_redraw()
+
+    def append_many(self, items):
+        self.schedule_redraw()
+
+    def clear_list(self) -> None:
+        self.first = 0
+        self.follow = True
+        self._shown = (0, 0)
+        self.list.delete(0, tk.END)
+        self.schedule_redraw()
+
+    def schedule_redraw(self) -> None:
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after(self.frame_ms, self.redraw)
+
+    def redraw(self) -> None:
+        self._redraw_pending = False
+        # a bounded store evicts the oldest rows, the positions in the Listbox
+        # are counted from the first row ever appended instead
+        evicted = self.items.total - len(self.items)
+        last_first = max(0, len(self.items) - self.rows)
+        self.first = last_first if self.follow else min(self.first, last_first)
+        end = min(len(self.items), self.first + self.rows)
+        first, shown_first, shown_end = evicted + self.first, *self._shown
+        if shown_first <= first <= shown_end <= evicted + end:
+            # the window only moved forward - drop the old rows, add the new ones
+            if first > shown_first:
+                self.list.delete(0, first - shown_first - 1)
+            start = shown_end - evicted
+        else:
+            self.list.delete(0, tk.END)
+            start = self.first
+        if start < end:
+            self.list.insert(tk.END, *[str(item) for item in self.items[start:end]])
+        self._shown = (first, evicted + end)
+        total = len(self.items) or 1
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + self.rows) / total))
+
+    def scroll(self, action: str, amount, unit: str = 'units') -> str:
+        if action == 'moveto':
+            self.first = int(float(amount) * len(self.items))
+        else:
+            step = self.rows if unit == 'pages' else 1
+            self.first += int(amount) * step
+        self.first = max(0, min(self.first, len(self.items) - self.rows))
+        self.follow = self.first + self.rows >= len(self.items)
+        self.schedule_redraw()
+        return 'break'      # the Listbox must not scroll its few rows itself
+
+    def resize(self, event) -> None:
+        self.rows = max(1, event.height // self._line_height)
+        self.schedule_redraw()
+
+
 # Strategy pattern (different strategies)
 def generate_uuid1() -> uuid.UUID:
     return uuid.uuid1()
@@ -106,21 +334,110 @@ def generate_uuid4() -> uuid.UUID:
 def generate_simple_string() -> str:
     return ''.join(random.choices(string.ascii_lowercase, k=30))
 
+NAMES = [
+    'John',
+    'Michal',
+    'Penny'
+]
+
 def generate_name() -> str:
-    names = [
-        'John',
-        'Michal',
-        'Penny'
+    return random.choice(NAMES)
+
+
+# Batch variants of the strategies - one call (and one syscall) per batch,
+# not per ID. Big batches are generated block by block to bound memory.
+BLOCK = 64 * 1024
+
+_UUID4_MASK = ~((0xf000 << 64) | (0xc000 << 48)) & ((1 << 128) - 1)
+_UUID4_BITS = (4 << 76) | (0x8000 << 48)
+
+def generate_uuid4_many(n: int) -> List[uuid.UUID]:
+    ids = []
+    for done in range(0, n, BLOCK):
+        buffer = os.urandom(16 * min(BLOCK, n - done))
+        ids.extend(
+            uuid.UUID(int=(high << 64 | low) & _UUID4_MASK | _UUID4_BITS)
+            for high, low in struct.iter_unpack('>QQ', buffer)
+        )
+    return ids
+
+_uuid1_lock = threading.Lock()
+_uuid1_last_timestamp = 0
+# the reserved timestamps are unique within a process only, processes
+# generating side by side set their own clock sequences to stay apart
+_uuid1_clock_seq: Optional[int] = None
+
+def set_uuid1_clock_seq(clock_seq: Optional[int]) -> None:
+    """Fix the 14 bit clock sequence of this process, None is random per batch."""
+    global _uuid1_clock_seq  # pylint: disable=global-statement
+    if clock_seq is not None and not 0 <= clock_seq < 1 << 14:
+        raise ValueError(f'clock_seq has 14 bits, {clock_seq} does not fit')
+    _uuid1_clock_seq = clock_seq
+
+def _reserve_timestamps(n: int) -> int:
+    """Reserve n consecutive, never reused 100 ns UUID1 timestamps."""
+    global _uuid1_last_timestamp  # pylint: disable=global-statement
+    # 100 ns intervals since the UUID epoch, 15 October 1582
+    timestamp = time.time_ns() // 100 + 0x01b21dd213814000
+    with _uuid1_lock:
+        timestamp = max(timestamp, _uuid1_last_timestamp + 1)
+        _uuid1_last_timestamp = timestamp + n - 1
+    return timestamp
+
+def generate_uuid1_many(n: int) -> List[uuid.UUID]:
+    first = _reserve_timestamps(n)
+    clock_seq = random.getrandbits(14) if _uuid1_clock_seq is None else _uuid1_clock_seq
+    tail = (((clock_seq >> 8) | 0x80) << 56) | ((clock_seq & 0xff) << 48) | uuid.getnode()
+    return [
+        uuid.UUID(int=(
+            (timestamp & 0xffffffff) << 96
+            | ((timestamp >> 32) & 0xffff) << 80
+            | (((timestamp >> 48) & 0x0fff) | 0x1000) << 64
+            | tail
+        ))
+        for timestamp in range(first, first + n)
     ]
-    return ''.join(random.choices(names))
+
+# 234 is the biggest multiple of 26 which fits into a byte, the bytes above
+# it are dropped, so every letter has the same probability.
+_LETTERS = (string.ascii_lowercase * 10).encode()[:234] + bytes(22)
+_REJECTED = bytes(range(234, 256))
+
+def generate_simple_string_many(n: int, k: int = 30) -> List[str]:
+    letters = ''
+    needed = n * k
+    while len(letters) < needed:
+        size = min(BLOCK * k, needed - len(letters))
+        # ask for ~10 % more, some of the bytes are rejected
+        letters += os.urandom(size + size // 8 + 16).translate(_LETTERS, _REJECTED).decode('ascii')
+    return [letters[start:start + k] for start in range(0, needed, k)]
+
+def generate_name_many(n: int) -> List[str]:
+    return random.choices(NAMES, k=n)
+
+
+batch_strategies: Dict[Callable, Callable[[int], list]] = {
+    generate_uuid1: generate_uuid1_many,
+    generate_uuid4: generate_uuid4_many,
+    generate_simple_string: generate_simple_string_many,
+    generate_name: generate_name_many,
+}
+
+def generate_many(strategy: Callable, n: int) -> list:
+    """Generate n values with the batch variant of the strategy, if there is one."""
+    batch = batch_strategies.get(strategy)
+    if batch is not None:
+        return batch(n)
+    return [strategy() for _ in range(n)]
 
 
 class MyController(Controller):
 
-    def __init__(self, view: TkView, model: Model, buttons: Dict[str, Callable]) -> None:
+    def __init__(self, view: TkView, model: Model, buttons: Dict[str, Callable], batch_size: int = 1) -> None:
         self.view = view
         self.model = model
         self.buttons = buttons
+        self.batch_size = batch_size
 
     def start(self) -> None:
         self.view.setup(self)
@@ -128,23 +445,33 @@ class MyController(Controller):
 
     def handle_button(self, button_name: str) -> None:
         # generate a uuid and add it to the list
-        self.model.uuid.append(self.buttons[button_name]())
-        self.view.append_to_list(self.model.uuid[-1])
+        if self.batch_size == 1:
+            value = self.buttons[button_name]()
+            self.model.uuid.append(value)
+            self.view.append_to_list(value)
+        else:
+            values = generate_many(self.buttons[button_name], self.batch_size)
+            self.model.uuid.extend(values)
+            self.view.append_many(values)
 
     def handle_click_clear_list(self) -> None:
         # Clear the list of UUIDs in the user interface
-        self.model.uuid = []
+        self.model.uuid.clear()
         self.view.clear_list()
 
 
+# button name -> strategy, the registry of all strategies
+buttons = {
+    'Generate UUID1':  generate_uuid1,
+    'Generate UUID4':  generate_uuid4,
+    'Generate string': generate_simple_string,
+    'Generate Name':   generate_name,
+}
+
+
 def main() -> int:
-    buttons = {
-        'Generate UUID1':  generate_uuid1,
-        'Generate UUID4':  generate_uuid4,
-        'Generate string': generate_simple_string,
-        'Generate Name':   generate_name,
-    }
-    controller = MyController(TkView(), Model(), buttons)
+    model = Model()
+    controller = MyController(VirtualTkView(model.uuid), model, buttons)
     controller.start()
 
     return 0
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""Quote model with 10^6 quotes - the log store vs the old in-memory list."""
+
+import os
+import random
+import tempfile
+import time
+
+from mvc.mvc_example1 import Model
+
+COUNT = 1_000_000
+SAMPLE = 10_000
+
+
+def timed(label: str, run, operations: int) -> None:
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    print(f'{label:40} {operations / seconds:12,.0f} ops/s')
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quotes.log')
+        model = Model(path)
+        texts = [f'Quote number {i} - nothing will work unless you do.' for i in range(COUNT)]
+
+        timed('store: add_quote', lambda: [model.add_quote(text) for text in texts], COUNT)
+        ids = random.sample(range(1, COUNT), SAMPLE)
+        timed('store: get_quote', lambda: [model.get_quote(i) for i in ids], SAMPLE)
+        timed('store: del_quote', lambda: [model.del_quote(i) for i in ids], SAMPLE)
+
+        # delete most of the log, so compaction kicks in
+        doomed = range(1, COUNT // 2 + 100_000)
+        timed('store: del_quote + background compaction', lambda: (
+            [model.store.delete(i) for i in doomed], model.store.wait_for_compaction()
+        ), len(doomed))
+        print(f'log size {os.path.getsize(path) / 1e6:.1f} MB, {len(model.store):,} live quotes')
+        model.store.close()
+
+        timed('store: reopen and rebuild the index', lambda: Model(path).store.close(), 1)
+
+    quotes = list(texts)
+    positions = sorted((random.randrange(COUNT - SAMPLE) for _ in range(SAMPLE)), reverse=True)
+    timed('list: quotes[i]', lambda: [quotes[i] for i in positions], SAMPLE)
+    timed('list: quotes.pop(i)', lambda: [quotes.pop(i) for i in positions], SAMPLE)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
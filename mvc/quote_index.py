@@ -0,0 +1,154 @@
+"""Inverted full-text index for the quote model.
+
+Every term maps to a posting dict {quote id: term frequency}. Terms are also
+kept in a sorted list, so a prefix query is a bisect plus a walk over the
+matching terms. Queries are AND queries - every query term has to match - and
+the hits are ranked by BM25.
+
+The index is updated incrementally, add() and remove() only touch the
+postings of the terms of one quote.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOKEN = re.compile(r"\w+(?:'\w+)*")
+QUERY_TOKEN = re.compile(r"\w+(?:'\w+)*\*?")
+PREFIX = '*'
+# shortest unfinished word searched as a prefix, 'a' would match half the index
+MIN_PREFIX = 3
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.casefold())
+
+
+class QuoteIndex:
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.terms: List[str] = []    # sorted, for prefix queries
+        self.lengths: Dict[int, int] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def add(self, quote_id: int, text: str) -> None:
+        tokens = tokenize(text)
+        if quote_id in self.lengths:
+            raise KeyError(f'quote {quote_id} is already indexed')
+        self.lengths[quote_id] = len(tokens)
+        self.total_length += len(tokens)
+        for term, count in Counter(tokens).items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                insort(self.terms, term)
+            posting[quote_id] = count
+
+    def add_many(self, quotes: Iterable[Tuple[int, str]]) -> None:
+        self.terms = []    # skip insort for every new term, sort once at the end
+        try:
+            for quote_id, text in quotes:
+                self.add(quote_id, text)
+        finally:
+            self.terms = sorted(self.postings)
+
+    def remove(self, quote_id: int, text: str) -> None:
+        """Drop a quote, text is the indexed text of the quote."""
+        length = self.lengths.pop(quote_id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in set(tokenize(text)):
+            posting = self.postings[term]
+            del posting[quote_id]
+            if not posting:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def expand(self, prefix: str) -> List[str]:
+        """All indexed terms starting with prefix."""
+        terms = self.terms
+        start = bisect_left(terms, prefix)
+        end = start
+        while end < len(terms) and terms[end].startswith(prefix):
+            end += 1
+        return terms[start:end]
+
+    def _idf(self, posting: Dict[int, int]) -> float:
+        count = len(self.lengths)
+        return math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+
+    def _matches(self, word: str) -> List[str]:
+        if word.endswith(PREFIX):
+            return self.expand(word.rstrip(PREFIX))
+        return [word] if word in self.postings else []
+
+    def _scores(self, terms: List[str], within: Optional[Dict[int, float]]) -> Dict[int, float]:
+        """BM25 scores of the terms, only of the quotes within if given."""
+        lengths = self.lengths
+        base = K1 * (1 - B)
+        scale = K1 * B * len(lengths) / self.total_length
+        scores: Dict[int, float] = {}
+        for term in terms:
+            posting = self.postings[term]
+            weight = self._idf(posting) * (K1 + 1)
+            if within is None:
+                counts = posting.items()
+            elif len(within) < len(posting):
+                counts = ((quote_id, posting[quote_id]) for quote_id in within if quote_id in posting)
+            else:
+                counts = ((quote_id, count) for quote_id, count in posting.items() if quote_id in within)
+            term_scores = {
+                quote_id: weight * count / (count + base + scale * lengths[quote_id])
+                for quote_id, count in counts
+            }
+            if not scores:
+                scores = term_scores
+                continue
+            # best matching expansion of a prefix counts, not the sum
+            for quote_id, score in term_scores.items():
+                if score > scores.get(quote_id, 0.0):
+                    scores[quote_id] = score
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Best matching (quote id, score) pairs, the last word is a prefix.
+
+        A word ending with '*' is a prefix anywhere in the query. A query
+        ending with a space, or with a word shorter than MIN_PREFIX, has no
+        prefix word at the end.
+        """
+        words = QUERY_TOKEN.findall(query.casefold())
+        # no indexed quote has a term, e.g. only '' or punctuation
+        if not words or not self.lengths or not self.total_length:
+            return []
+        if not query[-1:].isspace() and len(words[-1]) >= MIN_PREFIX:
+            # search as you type - the last word may be unfinished
+            words[-1] = words[-1].rstrip(PREFIX) + PREFIX
+
+        # the rarest word first, the others only score its candidates
+        matches = sorted(
+            (self._matches(word) for word in words),
+            key=lambda terms: sum(len(self.postings[term]) for term in terms),
+        )
+        total: Optional[Dict[int, float]] = None
+        for terms in matches:
+            scores = self._scores(terms, total)
+            if total is None:
+                total = scores
+            else:
+                total = {quote_id: score + total[quote_id] for quote_id, score in scores.items()}
+            if not total:
+                return []
+        return heapq.nlargest(limit, total.items(), key=lambda item: (item[1], -item[0]))
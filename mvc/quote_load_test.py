@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""Load test of the quote HTTP server - requests per second and p99 latency.
+
+Without --port a server with a fresh quote log is started in a subprocess,
+so the clients do not share the interpreter with it. Every client keeps one
+keep-alive connection and sends requests back to back: mostly selects of a
+few hot quotes, some searches and some adds and deletes.
+
+Usage:
+    python -m mvc.quote_load_test [--clients N] [--seconds S] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+MIX = (('select', 0.90), ('search', 0.06), ('add', 0.03), ('delete', 0.01))
+SEED_QUOTES = 10_000
+HOT = 100
+WORDS = ['ideas', 'happen', 'deliver', 'expected', 'afraid', 'work', 'people', 'higher']
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def request(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        body: bytes = b'',
+        ) -> Tuple[int, bytes]:
+    writer.write(
+        f'{method} {target} HTTP/1.1\r\nHost: quotes\r\nContent-Length: {len(body)}\r\n\r\n'.encode()
+        + body
+    )
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    length = next(int(line.split(':')[1]) for line in lines if line.lower().startswith('content-length'))
+    return status, await reader.readexactly(length)
+
+
+async def client(port: int, deadline: float, seed: int, latencies: Dict[str, List[float]]) -> int:
+    rng = random.Random(seed)
+    kinds, weights = zip(*MIX)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    errors = 0
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            if kind == 'select':
+                args = ('GET', f'/quotes/{rng.randint(1, HOT)}')
+            elif kind == 'search':
+                args = ('GET', f'/search?q={rng.choice(WORDS)}')
+            elif kind == 'add':
+                args = ('POST', '/quotes', f'Quote of client {seed} - {rng.random()}'.encode())
+            else:
+                args = ('DELETE', f'/quotes/{rng.randint(HOT + 1, SEED_QUOTES)}')
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, *args)
+            latencies[kind].append(time.perf_counter() - start)
+            # a delete of a deleted quote is a 404, anything else is an error
+            errors += status >= 500 or (status != 200 and kind != 'delete')
+    finally:
+        writer.close()
+    return errors
+
+
+async def seed(port: int) -> None:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for number in range(SEED_QUOTES):
+        await request(reader, writer, 'POST', '/quotes',
+                      f'{random.choice(WORDS)} quote number {number}, {random.choice(WORDS)}'.encode())
+    writer.close()
+
+
+async def run(port: int, clients: int, seconds: float) -> None:
+    await seed(port)
+    latencies: Dict[str, List[float]] = {kind: [] for kind, _ in MIX}
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(client(port, deadline, i, latencies) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    every = sorted(latency for values in latencies.values() for latency in values)
+    print(f'{clients} clients, {len(every):,} requests, {sum(errors)} errors')
+    print(f'{len(every) / elapsed:10,.0f} requests/s')
+    for kind, values in [('all', every)] + list(latencies.items()):
+        values = sorted(values)
+        if values:
+            print(f'{kind:8} p50 {values[len(values) // 2] * 1e3:7.2f} ms   '
+                  f'p99 {values[int(len(values) * 0.99)] * 1e3:7.2f} ms   n={len(values):,}')
+
+
+async def wait_for_server(port: int, timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            return
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load test the quote HTTP server.')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--port', type=int, help='test a running server instead of starting one')
+    args = parser.parse_args(argv)
+
+    if args.port:
+        asyncio.run(run(args.port, args.clients, args.seconds))
+        return 0
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'mvc.quote_server', '--port', str(port),
+             '--path', os.path.join(tmp, 'quotes.log')],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(wait_for_server(port))
+            asyncio.run(run(port, args.clients, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+"""HTTP front-end for the quote model, many clients instead of one terminal.
+
+    GET    /quotes/<num>       like 1 - Select a quote
+    POST   /quotes             like 2 - Add a new quote, the body is the quote
+    DELETE /quotes/<num>       like 3 - Delete an already existing quote
+    GET    /search?q=<words>   like 4 - Search quotes
+
+The server is a single asyncio loop speaking keep-alive HTTP/1.1. Writes are
+serialized, they wait until the running reads are done and run one at a time.
+Searches share the search index, so they take the read side of the same lock
+and run concurrently in a thread pool, the loop keeps serving meanwhile.
+Selecting a quote is a dict lookup and a pread, it runs on the loop and the
+responses of the hot quotes are cached until the quote is deleted.
+
+Usage:
+    python -m mvc.quote_server [--host HOST] [--port PORT] [--path QUOTES_LOG]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from mvc.mvc_example1 import Model
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+}
+MAX_BODY = 1 << 16
+
+
+class ReadWriteLock:
+    """Many readers or one writer, a waiting writer blocks new readers."""
+
+    def __init__(self) -> None:
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextlib.asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class HttpView:
+
+    def __init__(self, model: Model, workers: int = 4, cache_size: int = 1024) -> None:
+        self.model = model
+        self.lock = ReadWriteLock()
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='quotes')
+        self.cache: 'OrderedDict[int, bytes]' = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+
+    def status(self, code: int, msg: str) -> int:
+        # the model reports errors as code 1 and a message
+        if code == 0:
+            return 200
+        return 404 if msg == 'Not found' else 400
+
+    async def _run(self, operation: Callable, *args) -> Tuple[int, str]:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, operation, *args)
+
+    def select(self, num: str) -> Tuple[int, bytes]:
+        try:
+            quote_id: Optional[int] = int(num)
+        except ValueError:
+            quote_id = None
+        body = self.cache.get(quote_id)
+        if body is not None:
+            self.cache.move_to_end(quote_id)
+            self.cache_hits += 1
+            return 200, body
+        code, msg = self.model.get_quote(num)
+        body = msg.encode()
+        if code == 0:
+            self.cache[quote_id] = body
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return self.status(code, msg), body
+
+    async def search(self, query: str) -> Tuple[int, bytes]:
+        async with self.lock.read():
+            code, msg = await self._run(self.model.search_quotes, query)
+        return self.status(code, msg), msg.encode()
+
+    async def add(self, quote: str) -> Tuple[int, bytes]:
+        async with self.lock.write():
+            code, msg = await self._run(self.model.add_quote, quote)
+        return self.status(code, msg), msg.encode()
+
+    async def delete(self, num: str) -> Tuple[int, bytes]:
+        async with self.lock.write():
+            code, msg = await self._run(self.model.del_quote, num)
+        if code == 0:
+            self.cache.pop(int(num), None)
+        return self.status(code, msg), msg.encode()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        if parts == ['quotes']:
+            if method == 'POST':
+                return await self.add(body.decode(errors='replace'))
+            return 405, b'Use POST'
+        if len(parts) == 2 and parts[0] == 'quotes':
+            if method == 'GET':
+                return self.select(parts[1])
+            if method == 'DELETE':
+                return await self.delete(parts[1])
+            return 405, b'Use GET or DELETE'
+        if parts == ['search'] and method == 'GET':
+            query = parse_qs(url.query).get('q', [''])[0]
+            return await self.search(query)
+        return 404, b'Unknown resource'
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                    headers: Dict[str, str] = {}
+                    for line in lines[1:]:
+                        if line:
+                            name, _, value = line.partition(':')
+                            headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0))
+                    if not 0 <= length <= MAX_BODY:
+                        raise ValueError(f'body is limited to {MAX_BODY} bytes')
+                except ValueError as err:
+                    writer.write(self.response(400, str(err).encode(), keep_alive=False))
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except Exception:  # pylint: disable=broad-except
+                    # a bug must not drop the connection without an answer
+                    traceback.print_exc()
+                    status, payload = 500, b'Internal server error'
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def response(self, status: int, payload: bytes, keep_alive: bool = True) -> bytes:
+        head = (
+            f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+            f'Content-Type: text/plain; charset=utf-8\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+        )
+        return head.encode() + payload
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000) -> None:
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        for sock in server.sockets:
+            print(f'Serving quotes on http://{sock.getsockname()[0]}:{sock.getsockname()[1]}',
+                  flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Serve the quotes over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--path', default='quotes.log')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    model = Model(args.path)
+    try:
+        asyncio.run(HttpView(model, workers=args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        model.store.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""Append-only log storage engine for the quote model.
+
+Every change is appended to a log file as a record:
+
+    op (1 byte, b'A' add / b'D' delete) | quote id (8 bytes) |
+    payload length (4 bytes) | crc32 of the payload (4 bytes) | payload
+
+The in-memory index maps a quote id to the offset of its payload, so a lookup
+is a dict access and a single pread(). Deletes only append a tombstone and
+drop the id from the index. When dead records take more space than the live
+ones, a background thread compacts the log - it copies the live records into
+a new file and atomically replaces the old one.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+HEADER = struct.Struct('>cQII')
+ADD = b'A'
+DELETE = b'D'
+
+
+class QuoteStore:
+
+    def __init__(self, path: str, sync: bool = False, compact_min_bytes: int = 1 << 20) -> None:
+        self.path = path
+        self.sync = sync
+        self.compact_min_bytes = compact_min_bytes
+        self._lock = threading.RLock()
+        self._compacting: Optional[threading.Thread] = None
+        self._retired: list = []
+        self.next_id = 1
+        self.dead_bytes = 0
+        # (file descriptor, index) replaced together, so readers never mix them
+        self._state: Tuple[int, Dict[int, Tuple[int, int]]] = self._open(path)
+
+    def _open(self, path: str) -> Tuple[int, Dict[int, Tuple[int, int]]]:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        index: Dict[int, Tuple[int, int]] = {}
+        size = os.fstat(fd).st_size
+        offset = 0
+        while offset + HEADER.size <= size:
+            op, quote_id, length, crc = HEADER.unpack(os.pread(fd, HEADER.size, offset))
+            payload = os.pread(fd, length, offset + HEADER.size)
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            record = HEADER.size + length
+            if op == ADD:
+                index[quote_id] = (offset + HEADER.size, length)
+            else:
+                old = index.pop(quote_id, None)
+                self.dead_bytes += record + (HEADER.size + old[1] if old else 0)
+            self.next_id = max(self.next_id, quote_id + 1)
+            offset += record
+        if offset != size:
+            # torn write at the end of the log, drop it
+            os.ftruncate(fd, offset)
+        self._end = offset
+        return fd, index
+
+    def close(self) -> None:
+        self.wait_for_compaction()
+        with self._lock:
+            fd, _ = self._state
+            os.close(fd)
+            for old in self._retired:
+                os.close(old)
+            self._retired = []
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    def __contains__(self, quote_id: int) -> bool:
+        return quote_id in self._state[1]
+
+    def ids(self) -> Iterator[int]:
+        return iter(list(self._state[1]))
+
+    def get(self, quote_id: int) -> Optional[str]:
+        fd, index = self._state
+        entry = index.get(quote_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        return os.pread(fd, length, offset).decode()
+
+    def _append(self, op: bytes, quote_id: int, payload: bytes) -> int:
+        fd, _ = self._state
+        record = HEADER.pack(op, quote_id, len(payload), zlib.crc32(payload)) + payload
+        os.write(fd, record)
+        if self.sync:
+            os.fsync(fd)
+        offset = self._end + HEADER.size
+        self._end += len(record)
+        return offset
+
+    def add(self, quote: str) -> int:
+        payload = quote.encode()
+        with self._lock:
+            quote_id = self.next_id
+            offset = self._append(ADD, quote_id, payload)
+            self._state[1][quote_id] = (offset, len(payload))
+            self.next_id += 1
+        return quote_id
+
+    def delete(self, quote_id: int) -> Optional[str]:
+        with self._lock:
+            quote = self.get(quote_id)
+            if quote is None:
+                return None
+            self._append(DELETE, quote_id, b'')
+            length = self._state[1].pop(quote_id)[1]
+            self.dead_bytes += 2 * HEADER.size + length
+            self._maybe_compact()
+        return quote
+
+    def _maybe_compact(self) -> None:
+        live = self._end - self.dead_bytes
+        if self.dead_bytes > max(live, self.compact_min_bytes) and self._compacting is None:
+            self._compacting = threading.Thread(target=self.compact, daemon=True)
+            self._compacting.start()
+
+    def wait_for_compaction(self) -> None:
+        thread = self._compacting
+        if thread is not None:
+            thread.join()
+
+    def compact(self) -> None:
+        """Rewrite the log with live records only, writers wait just for the swap."""
+        tmp_path = f'{self.path}.compact'
+        try:
+            with self._lock:
+                fd, index = self._state
+                snapshot = dict(index)
+                snapshot_end = self._end
+                last_id = self.next_id - 1
+
+            new_fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        except OSError:
+            self._compacting = None
+            raise
+        try:
+            new_index: Dict[int, Tuple[int, int]] = {}
+            new_end = 0
+            chunk = []
+            for quote_id in sorted(snapshot):
+                offset, length = snapshot[quote_id]
+                payload = os.pread(fd, length, offset)
+                chunk.append(HEADER.pack(ADD, quote_id, length, zlib.crc32(payload)) + payload)
+                new_index[quote_id] = (new_end + HEADER.size, length)
+                new_end += HEADER.size + length
+                if len(chunk) >= 1024:
+                    os.write(new_fd, b''.join(chunk))
+                    chunk = []
+            if last_id and last_id not in snapshot:
+                # keep the tombstone of the highest id, so ids are never reused
+                chunk.append(HEADER.pack(DELETE, last_id, 0, zlib.crc32(b'')))
+                new_end += HEADER.size
+            os.write(new_fd, b''.join(chunk))
+
+            with self._lock:
+                # replay whatever was written while copying
+                tail = os.pread(fd, self._end - snapshot_end, snapshot_end)
+                position = 0
+                while position < len(tail):
+                    op, quote_id, length, _ = HEADER.unpack_from(tail, position)
+                    if op == ADD:
+                        new_index[quote_id] = (new_end + position + HEADER.size, length)
+                    else:
+                        new_index.pop(quote_id, None)
+                    position += HEADER.size + length
+                os.write(new_fd, tail)
+                os.fsync(new_fd)
+                os.replace(tmp_path, self.path)
+
+                live = sum(HEADER.size + length for _, length in new_index.values())
+                self._end = new_end + len(tail)
+                self.dead_bytes = self._end - live
+                # readers may still use the old descriptor, close it next time
+                for old in self._retired:
+                    os.close(old)
+                self._retired = [fd]
+                self._state = (new_fd, new_index)
+        except BaseException:
+            os.close(new_fd)
+            raise
+        finally:
+            self._compacting = None
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""Query latency of the quote index vs a linear scan over the quotes.
+
+The quotes are random sentences over a Zipf distributed vocabulary, so there
+are very common words (like 'the') and rare ones, like in real text.
+"""
+
+import itertools
+import random
+import time
+from typing import Callable, List
+
+from mvc.quote_index import PREFIX, QUERY_TOKEN, QuoteIndex, tokenize
+
+SIZES = (100_000, 1_000_000)
+VOCABULARY = 20_000
+WORDS_PER_QUOTE = 10
+QUERIES = 20
+
+
+def make_vocabulary(rng: random.Random) -> List[str]:
+    syllables = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'de', 'pa', 'ge', 'zu']
+    words = set()
+    while len(words) < VOCABULARY:
+        words.add(''.join(rng.choices(syllables, k=rng.randint(1, 4))))
+    return sorted(words, key=len)
+
+
+def make_quotes(rng: random.Random, vocabulary: List[str], count: int) -> List[str]:
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    return [
+        ' '.join(rng.choices(vocabulary, cum_weights=weights, k=WORDS_PER_QUOTE)).capitalize() + '.'
+        for _ in range(count)
+    ]
+
+
+def linear_search(quotes: List[str], query: str, limit: int = 10) -> List[int]:
+    """What a search without the index has to do - look at every quote."""
+    words = QUERY_TOKEN.findall(query.casefold())
+    hits = []
+    for quote_id, quote in enumerate(quotes, 1):
+        tokens = tokenize(quote)
+        if all(any(token.startswith(word.rstrip(PREFIX)) for token in tokens)
+               if word.endswith(PREFIX) else word in tokens for word in words):
+            hits.append(quote_id)
+    return hits[:limit]
+
+
+def latency(search: Callable[[str], list], queries: List[str]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1e3
+
+
+def main() -> int:
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+    for size in SIZES:
+        quotes = make_quotes(rng, vocabulary, size)
+        index = QuoteIndex()
+        start = time.perf_counter()
+        index.add_many(enumerate(quotes, 1))
+        print(f'{size:,} quotes, index built in {time.perf_counter() - start:.1f} s')
+
+        kinds = {
+            'common word': [f'{vocabulary[rng.randrange(10)]} ' for _ in range(QUERIES)],
+            'rare word': [f'{vocabulary[rng.randrange(1000, VOCABULARY)]} ' for _ in range(QUERIES)],
+            'two words': [f'{rng.choice(vocabulary[:100])} {rng.choice(vocabulary[:1000])} '
+                          for _ in range(QUERIES)],
+            'prefix': [f'{rng.choice(vocabulary[100:1000])[:3]}*' for _ in range(QUERIES)],
+        }
+        for kind, queries in kinds.items():
+            indexed = latency(index.search, queries)
+            scanned = latency(lambda query: linear_search(quotes, query), queries[:2])
+            print(f'  {kind:12} index {indexed:9.3f} ms   scan {scanned:9.1f} ms   '
+                  f'{scanned / indexed:8.0f}x')
+
+        start = time.perf_counter()
+        for quote_id in range(1, 1001):
+            index.remove(quote_id, quotes[quote_id - 1])
+            index.add(size + quote_id, quotes[quote_id - 1])
+        print(f'  incremental remove + add {(time.perf_counter() - start) * 1e3:.3f} us per quote')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
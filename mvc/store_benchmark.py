@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+"""Memory per stored ID - list of UUID objects vs the compact IdStore.
+
+The values are generated block by block while the memory is traced, so the
+list is charged for the objects it keeps alive, like Model.uuid used to be.
+Tracing slows everything down, the rates are only good for comparison.
+"""
+
+import time
+import tracemalloc
+from typing import Callable
+
+from mvc.mvc_with_strategy import IdStore, generate_simple_string_many, generate_uuid4_many
+
+COUNT = 1_000_000
+BLOCK = 10_000
+
+
+def measure(label: str, make_container: Callable, generate: Callable[[int], list]) -> None:
+    tracemalloc.start()
+    container = make_container()
+    start = time.perf_counter()
+    for _ in range(COUNT // BLOCK):
+        container.extend(generate(BLOCK))
+    seconds = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:36} {memory / COUNT:7.1f} B/ID  {COUNT / seconds:12,.0f} IDs/s')
+
+
+def main() -> int:
+    for kind, generate in (('UUID', generate_uuid4_many), ('string', generate_simple_string_many)):
+        measure(f'list of {kind}', list, generate)
+        measure(f'IdStore of {kind}', IdStore, generate)
+        measure(f'IdStore(capacity=100_000) of {kind}', lambda: IdStore(capacity=100_000), generate)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Observer pattern example."""
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""A sensor with 20 000 alarm subscribers - every one filtering the values
+itself vs the publisher's interval index."""
+
+import random
+import time
+from typing import Callable
+
+from observer.observer import Group, Subscriber, TemperatureSensor
+
+SUBSCRIBERS = 20_000
+VALUES = 200
+
+
+class CountingSubscriber(Subscriber):
+
+    calls = 0
+
+    def __init__(self, name: str, low: float, high: float) -> None:
+        super().__init__(name)
+        self.low = low
+        self.high = high
+
+    def update(self, publisher) -> None:
+        CountingSubscriber.calls += 1
+
+
+class FilteringSubscriber(CountingSubscriber):
+
+    matched = 0
+
+    def update(self, publisher) -> None:
+        CountingSubscriber.calls += 1
+        if self.low <= publisher.data <= self.high:
+            FilteringSubscriber.matched += 1
+
+
+def timed(label: str, run: Callable[[], None]) -> None:
+    CountingSubscriber.calls = 0
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    print(f'{label:40} {seconds / VALUES * 1e3:8.3f} ms/value  '
+          f'{CountingSubscriber.calls / VALUES:9,.0f} updates/value')
+
+
+def main() -> int:
+    rng = random.Random(1)
+    ranges = []
+    for _ in range(SUBSCRIBERS):
+        # mostly alarms on too warm or too cold, some narrow bands
+        kind = rng.random()
+        if kind < 0.4:
+            ranges.append((rng.uniform(30, 60), None))
+        elif kind < 0.8:
+            ranges.append((None, rng.uniform(-30, 10)))
+        else:
+            low = rng.uniform(-30, 60)
+            ranges.append((low, low + rng.uniform(0.1, 2)))
+    values = [rng.gauss(20, 8) for _ in range(VALUES)]
+
+    group = Group('alarms')
+    filtering = TemperatureSensor('filtering')
+    indexed = TemperatureSensor('indexed')
+    for number, (low, high) in enumerate(ranges):
+        bounds = (-1e9 if low is None else low, 1e9 if high is None else high)
+        filtering.register(FilteringSubscriber(f'alarm {number}', *bounds), group)
+        indexed.register(CountingSubscriber(f'alarm {number}', *bounds), group, low, high)
+
+    start = time.perf_counter()
+    indexed.notify()    # the first notify builds the index
+    print(f'index of {SUBSCRIBERS:,} ranges built in {time.perf_counter() - start:.2f} s')
+
+    def publish(sensor: TemperatureSensor) -> Callable[[], None]:
+        def run() -> None:
+            for value in values:
+                sensor.data = value
+        return run
+
+    timed('every subscriber filters', publish(filtering))
+    timed('interval index', publish(indexed))
+    assert CountingSubscriber.calls == FilteringSubscriber.matched
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Value ranges of the subscribers, for content-based filtering.
+
+A subscriber may want only the values in a closed range low <= data <= high,
+either end may be open (None), so a threshold is a range too. The ranges are
+kept in a centered interval tree; the subscribers whose range contains a value
+are found in O(log n + k) for k matching of n ranges.
+
+The tree is rebuilt, in O(n log n), on the first lookup after the ranges
+changed, so registering many subscribers at once costs one build.
+"""
+
+from __future__ import annotations
+
+INFINITY = float('inf')
+
+
+class _Node:
+
+    __slots__ = ('center', 'by_low', 'by_high', 'left', 'right')
+
+    def __init__(self, center: float, by_low: list, by_high: list,
+                 left: _Node | None, right: _Node | None) -> None:
+        self.center = center
+        self.by_low = by_low      # ranges around the center, the lowest low first
+        self.by_high = by_high    # the same ranges, the highest high first
+        self.left = left
+        self.right = right
+
+
+def _build(ranges: list) -> _Node | None:
+    """ranges are (low, high, order, subscriber) tuples."""
+    if not ranges:
+        return None
+    ends = sorted(end for low, high, _, _ in ranges for end in (low, high) if abs(end) != INFINITY)
+    center = ends[len(ends) // 2] if ends else 0.0
+    left, right, here = [], [], []
+    for item in ranges:
+        if item[1] < center:
+            left.append(item)
+        elif item[0] > center:
+            right.append(item)
+        else:
+            here.append(item)
+    return _Node(
+        center,
+        sorted(here, key=lambda item: item[0]),
+        sorted(here, key=lambda item: -item[1]),
+        _build(left),
+        _build(right),
+    )
+
+
+class IntervalIndex:
+
+    def __init__(self) -> None:
+        self.ranges: dict[object, tuple] = {}
+        self._order = 0
+        self._tree: _Node | None = None
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def __contains__(self, subscriber: object) -> bool:
+        return subscriber in self.ranges
+
+    def add(self, subscriber: object, low: float | None = None, high: float | None = None) -> None:
+        low = -INFINITY if low is None else float(low)
+        high = INFINITY if high is None else float(high)
+        if low != low or high != high:
+            raise ValueError(f'NaN bound {low} - {high}')
+        if low > high:
+            raise ValueError(f'Empty range {low} - {high}')
+        self._order += 1
+        self.ranges[subscriber] = (low, high, self._order, subscriber)
+        self._stale = True
+
+    def remove(self, subscriber: object) -> None:
+        if self.ranges.pop(subscriber, None) is not None:
+            self._stale = True
+
+    def stab(self, value: float) -> list:
+        """Subscribers whose range contains the value, in registration order."""
+        if value != value:
+            # NaN compares false both ways, it would match every range at the root
+            raise ValueError('NaN is in no range')
+        if self._stale:
+            self._tree = _build(list(self.ranges.values()))
+            self._stale = False
+        found = []
+        node = self._tree
+        while node is not None:
+            if value < node.center:
+                for item in node.by_low:
+                    if item[0] > value:
+                        break
+                    found.append(item)
+                node = node.left
+            elif value > node.center:
+                for item in node.by_high:
+                    if item[1] < value:
+                        break
+                    found.append(item)
+                node = node.right
+            else:
+                found.extend(node.by_low)
+                break
+        if len(found) > 1:
+            found.sort(key=lambda item: item[2])
+        return [item[3] for item in found]
@@ -0,0 +1,291 @@
+"""Durable history of the publishers' data.
+
+A Journal attached to a publisher appends a fixed-width binary record
+(timestamp in ns, publisher id, value) on every notify(). Records go to
+memory-mapped segment files of a directory, a full segment is closed and the
+next one started; the file name is the timestamp of its first record and a
+sequence number, as many segments may start at one timestamp. The publisher
+ids are resolved in publishers.txt. The mapped pages are flushed to
+disk for a whole batch of records at once (group commit): every sync_every
+records or sync_interval seconds, whatever comes first, and on close().
+
+Timestamps never go back within a journal, a write stamped before the last
+one is refused, so a time range is found by a binary search. replay() pushes the range back through the publishers'
+notify(), batches() hands it over in bulk, unpacked segment slice by slice.
+
+Usage:
+    python -m observer.journal [DIRECTORY]
+"""
+
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+
+from observer.observer import Group, Publisher, Subscriber, TemperatureSensor
+
+RECORD = struct.Struct('<qId')    # timestamp ns, publisher id, value
+SEGMENT_RECORDS = 1 << 20         # 20 MiB segments
+NAMES = 'publishers.txt'
+SUFFIX = '.seg'
+TIMESTAMP_DIGITS = 20
+
+
+class Segment:
+
+    def __init__(self, path: str, records: int, writable: bool = False) -> None:
+        self.path = path
+        with open(path, mode='r+b' if writable else 'rb') as fh:
+            if writable and os.fstat(fh.fileno()).st_size < records * RECORD.size:
+                fh.truncate(records * RECORD.size)
+            self.map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        self.capacity = len(self.map) // RECORD.size
+        self.count = self._used()
+
+    def _used(self) -> int:
+        """Written records, the unused rest of a segment is zeroed."""
+        low, high = 0, self.capacity
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD.unpack_from(self.map, middle * RECORD.size)[0]:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def timestamp(self, index: int) -> int:
+        return RECORD.unpack_from(self.map, index * RECORD.size)[0]
+
+    def find(self, timestamp: int) -> int:
+        """Index of the first record at or after the timestamp."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self) -> None:
+        self.map.close()
+
+
+class Journal:
+
+    def __init__(self, directory: str, segment_records: int = SEGMENT_RECORDS,
+                 sync_every: int = 4096, sync_interval: float = 0.05) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_records = segment_records
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self._local = threading.local()     # the publisher being replayed on this thread
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._synced = 0          # byte offset flushed in the active segment
+        self._synced_at = time.monotonic()
+        self._last = 0
+        self._load_names()
+        self._active: Segment | None = None
+        files = self.segments()
+        self._sequence = len(files)
+        if files:
+            self._active = Segment(files[-1], segment_records, writable=True)
+            self._synced = self._active.count * RECORD.size
+            if self._active.count:
+                self._last = self._active.timestamp(self._active.count - 1)
+
+    def _load_names(self) -> None:
+        path = os.path.join(self.directory, NAMES)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as fh:
+                for line in fh:
+                    self._add_name(line.rstrip('\n'))
+
+    def _add_name(self, name: str) -> int:
+        self.ids[name] = len(self.names)
+        self.names.append(name)
+        return self.ids[name]
+
+    def segments(self) -> list[str]:
+        return sorted(
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory) if filename.endswith(SUFFIX)
+        )
+
+    def attach(self, publisher: Publisher) -> None:
+        """Journal the data of every notify() of the publisher."""
+        self.publisher_id(publisher.name)
+        publisher.journal = self
+
+    def publisher_id(self, name: str) -> int:
+        number = self.ids.get(name)
+        if number is None:
+            if '\n' in name:
+                raise ValueError(f'Publisher name {name!r} has a new line')
+            with self._lock:
+                number = self._add_name(name)
+                with open(os.path.join(self.directory, NAMES), encoding='utf-8', mode='a') as fh:
+                    fh.write(f'{name}\n')
+                    fh.flush()
+                    os.fsync(fh.fileno())
+        return number
+
+    def append(self, publisher: Publisher) -> None:
+        if getattr(self._local, 'replayed', None) is publisher:
+            # the notify() of a replayed record, it is in the journal already
+            self._local.replayed = None
+            return
+        number = self.ids.get(publisher.name)
+        if number is None:
+            number = self.publisher_id(publisher.name)
+        self.write(number, publisher.data)
+
+    def write(self, number: int, value: float, timestamp: int | None = None) -> None:
+        """Append a value of the publisher_id() number, stamped now by default."""
+        if timestamp is not None and timestamp < 1:
+            # a zero timestamp marks the unused rest of a segment
+            raise ValueError(f'Timestamp has to be positive, not {timestamp}')
+        with self._lock:
+            # never back, the time ranges are binary searched
+            if timestamp is None:
+                # the clock may step back, then the records share the last time
+                timestamp = max(time.time_ns(), self._last)
+            elif timestamp < self._last:
+                raise ValueError(f'Timestamp {timestamp} is before the last one, {self._last}')
+            self._last = timestamp
+            segment = self._active
+            if segment is None or segment.count == segment.capacity:
+                segment = self._rotate(timestamp)
+            RECORD.pack_into(segment.map, segment.count * RECORD.size, timestamp, number, value)
+            segment.count += 1
+            self._pending += 1
+            if self._pending >= self.sync_every or time.monotonic() - self._synced_at >= self.sync_interval:
+                self._sync()
+
+    def _rotate(self, timestamp: int) -> Segment:
+        if self._active is not None:
+            self._sync()
+            self._active.close()
+        path = os.path.join(self.directory, f'{timestamp:0{TIMESTAMP_DIGITS}d}-{self._sequence:010d}{SUFFIX}')
+        self._sequence += 1
+        open(path, mode='ab').close()
+        self._active = Segment(path, self.segment_records, writable=True)
+        self._synced = 0
+        return self._active
+
+    def _sync(self) -> None:
+        segment = self._active
+        end = segment.count * RECORD.size
+        if end > self._synced:
+            # flush wants a page aligned offset
+            start = self._synced - self._synced % mmap.PAGESIZE
+            segment.map.flush(start, end - start)
+            self._synced = end
+        self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._sync()
+                self._active.close()
+                self._active = None
+
+    def __enter__(self) -> Journal:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _slices(self, start: int, end: int) -> Iterator[bytes]:
+        """Bytes of the records with start <= timestamp < end, segment by segment."""
+        paths = self.segments()
+        firsts = [int(os.path.basename(path)[:TIMESTAMP_DIGITS]) for path in paths]
+        # records at start may end the last segment beginning before it
+        for number in range(max(bisect.bisect_left(firsts, start) - 1, 0), len(paths)):
+            if firsts[number] >= end:
+                break
+            with self._lock:
+                # the writer fills, flushes and closes the active segment
+                active = self._active is not None and self._active.path == paths[number]
+                if active:
+                    chunk = self._slice(self._active, start, end)
+            if not active:
+                segment = Segment(paths[number], self.segment_records)
+                try:
+                    chunk = self._slice(segment, start, end)
+                finally:
+                    segment.close()
+            yield chunk
+
+    @staticmethod
+    def _slice(segment: Segment, start: int, end: int) -> bytes:
+        return segment.map[segment.find(start) * RECORD.size:segment.find(end) * RECORD.size]
+
+    def batches(self, start: int = 0, end: int = sys.maxsize) -> Iterator[list[tuple[int, str, float]]]:
+        """(timestamp, publisher name, value) lists, one per segment slice."""
+        names = self.names
+        for chunk in self._slices(start, end):
+            yield [(timestamp, names[number], value) for timestamp, number, value in RECORD.iter_unpack(chunk)]
+
+    def replay(self, publishers: Iterable[Publisher], start: int = 0, end: int = sys.maxsize) -> int:
+        """Set the journaled data again, the publishers notify as usual.
+
+        Records of other publishers are skipped. Only the replayed records
+        themselves are not journaled again; whatever the subscribers publish
+        meanwhile, from this or any other thread, is journaled as usual.
+        Returns the number of replayed records.
+        """
+        by_id = {self.ids[publisher.name]: publisher for publisher in publishers if publisher.name in self.ids}
+        local = self._local
+        replayed = 0
+        try:
+            for chunk in self._slices(start, end):
+                for _, number, value in RECORD.iter_unpack(chunk):
+                    publisher = by_id.get(number)
+                    if publisher is not None:
+                        # notify() journals first, so this skips just this record
+                        local.replayed = publisher
+                        publisher.data = value
+                        replayed += 1
+        finally:
+            local.replayed = None
+        return replayed
+
+
+def main(argv: list[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    directory = argv[0] if argv else tempfile.mkdtemp(prefix='journal')
+
+    sensor = TemperatureSensor('temperature sensor 1')
+    with Journal(directory) as journal:
+        journal.attach(sensor)
+        start = time.time_ns()
+        for value in (10, 20, 30):
+            sensor.data = value
+
+        print(f'Replaying {directory}')
+        sensor.register(Subscriber('late subscriber'), Group('temperature sensors'))
+        journal.replay([sensor], start)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
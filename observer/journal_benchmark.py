@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""Journaling 10^6 sensor values and replaying them.
+
+Writes are measured with several group commit sizes, replay through notify()
+and in bulk through batches(); a real-time rate would be one value per
+publisher every few seconds.
+"""
+
+import shutil
+import tempfile
+import time
+from typing import Callable
+
+from observer.journal import Journal
+from observer.observer import Group, Subscriber, TemperatureSensor
+
+COUNT = 1_000_000
+SENSORS = 10
+
+
+class QuietSubscriber(Subscriber):
+
+    def update(self, publisher) -> None:
+        pass
+
+
+def timed(label: str, run: Callable[[], int]) -> int:
+    start = time.perf_counter()
+    count = run()
+    seconds = time.perf_counter() - start
+    print(f'{label:44} {seconds:6.2f} s  {count / seconds:12,.0f} records/s')
+    return count
+
+
+def sensors() -> list:
+    group = Group('temperature sensors')
+    made = []
+    for number in range(SENSORS):
+        sensor = TemperatureSensor(f'temperature sensor {number}')
+        sensor.register(QuietSubscriber('quiet'), group)
+        made.append(sensor)
+    return made
+
+
+def publish(publishers: list) -> int:
+    for value in range(COUNT // SENSORS):
+        for sensor in publishers:
+            sensor.data = value
+    return COUNT
+
+
+def main() -> int:
+    directory = tempfile.mkdtemp(prefix='journal_benchmark')
+    try:
+        timed('notify, no journal', lambda: publish(sensors()))
+
+        for sync_every in (1, 64, 4096):
+            path = f'{directory}/sync{sync_every}'
+            count = COUNT if sync_every > 1 else COUNT // 100
+            with Journal(path, segment_records=1 << 18, sync_every=sync_every) as journal:
+                timed(f'Journal.write, sync every {sync_every}', lambda: [
+                    journal.write(0, float(value)) for value in range(count)
+                ] and count)
+
+        with Journal(f'{directory}/sensors', segment_records=1 << 18) as journal:
+            publishers = sensors()
+            for sensor in publishers:
+                journal.attach(sensor)
+            start = time.time_ns()
+            timed('notify, journaled', lambda: publish(publishers))
+            print(f'{len(journal.segments())} segments')
+
+            timed('batches()', lambda: sum(len(batch) for batch in journal.batches(start)))
+            middle = range_of_middle(journal)
+            timed('batches(), time range of the middle half', lambda: sum(
+                len(batch) for batch in journal.batches(*middle)
+            ))
+            assert timed('replay() through notify', lambda: journal.replay(publishers, start)) == COUNT
+    finally:
+        shutil.rmtree(directory)
+
+    return 0
+
+
+def range_of_middle(journal: Journal) -> tuple:
+    timestamps = [timestamp for batch in journal.batches() for timestamp, _, _ in batch]
+    return timestamps[len(timestamps) // 4], timestamps[len(timestamps) * 3 // 4]
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
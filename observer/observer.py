@@ -1,18 +1,31 @@
 """Observer pattern.
 
-Output:
+Output (subscriber 4 gets the kitchen sensors through the topic broker, the
+alarm only the temperatures from 35 up):
 Publisher "temperature sensor 1" has data 10.0
+Publisher "temperature sensor 1" has data 10.0
+Publisher "temperature sensor 1" has data 20.0
 Publisher "temperature sensor 1" has data 20.0
 Publisher "temperature sensor 2" has data 30.0
 Publisher "temperature sensor 2" has data 40.0
+Publisher "temperature sensor 2" has data 40.0
+Publisher "humidity sensor 1" has data 50.0
 Publisher "humidity sensor 1" has data 50.0
 Publisher "humidity sensor 2" has data 60.0
 Publisher "humidity sensor 1" has data 70.0
+Publisher "humidity sensor 1" has data 70.0
 Publisher "humidity sensor 2" has data 80.0
 """
 
 from __future__ import annotations
 
+# the topics and the intervals are imported on first use, most publishers
+# need neither; TYPE_CHECKING without typing, that import costs more
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from observer.intervals import IntervalIndex
+    from observer.topics import Broker
+
 
 class Group:
 
@@ -27,12 +40,28 @@ class Group:
 
 
 class Publisher:
-    """Subject/Observable/Publisher."""
+    """Subject/Observable/Publisher.
 
-    def __init__(self, name: str) -> None:
+    A publisher with a topic, e.g. 'sensors/temperature/kitchen', notifies the
+    subscribers of the matching broker patterns too, e.g. 'sensors/+/kitchen',
+    through the shared broker of topics.py unless it has one of its own.
+
+    A subscriber registered with a low and/or high bound gets only the data
+    within them, the publisher looks the matching ones up in an interval index
+    instead of calling all of them.
+
+    With a journal (see journal.py) every notify() appends the data to it.
+    """
+
+    journal = None
+
+    def __init__(self, name: str, topic: str | None = None, broker: Broker | None = None) -> None:
         self.group = None
         self.name = name
+        self.topic = topic
+        self.broker = broker
         self.subscribers: dict[Group, list[Subscriber]] = {}
+        self.filtered: dict[Group, IntervalIndex] = {}
 
     def __str__(self) -> str:
         return self.name
@@ -40,20 +69,43 @@ class Publisher:
     def __repr__(self) -> str:
         return f'"{self.name}"'
 
-    def register(self, subscriber: Subscriber, group: Group) -> None:
+    def register(self, subscriber: Subscriber, group: Group,
+                 low: float | None = None, high: float | None = None) -> None:
         self.group = group
         self.subscribers.setdefault(group, [])
-        if subscriber not in self.subscribers[group]:
+        self.deregister(subscriber, group)
+        if low is None and high is None:
             self.subscribers[group].append(subscriber)
+        else:
+            index = self.filtered.get(group)
+            if index is None:
+                from observer.intervals import IntervalIndex
+                index = self.filtered[group] = IntervalIndex()
+            index.add(subscriber, low, high)
 
     def deregister(self, subscriber: Subscriber, group: Group) -> None:
         if subscriber in self.subscribers[group]:
             self.subscribers[group].remove(subscriber)
+        if group in self.filtered:
+            self.filtered[group].remove(subscriber)
 
     def notify(self) -> None:
+        # journaled before the subscribers run, they may publish again
+        if self.journal is not None:
+            self.journal.append(self)
         if self.group is not None:
-            for subscriber in self.subscribers[self.group]:
+            subscribers = self.subscribers[self.group]
+            index = self.filtered.get(self.group)
+            if index:
+                # looked up first, data out of every range (NaN) fails before any update
+                subscribers = subscribers + index.stab(self.data)
+            for subscriber in subscribers:
                 subscriber.update(self)
+        if self.topic is not None:
+            if self.broker is None:
+                from observer.topics import broker
+                self.broker = broker
+            self.broker.publish(self.topic, self)
 
 
 class Subscriber:
@@ -74,8 +126,8 @@ class Subscriber:
 
 class TemperatureSensor(Publisher):
 
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
+    def __init__(self, name: str, topic: str | None = None, broker: Broker | None = None) -> None:
+        super().__init__(name, topic, broker)
         self._temp = 30.0
 
     @property
@@ -90,8 +142,8 @@ class TemperatureSensor(Publisher):
 
 class HumiditySensor(Publisher):
 
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
+    def __init__(self, name: str, topic: str | None = None, broker: Broker | None = None) -> None:
+        super().__init__(name, topic, broker)
         self._humidity = 50.0
 
     @property
@@ -105,12 +157,13 @@ class HumiditySensor(Publisher):
 
 
 def main() -> int:
+    from observer.topics import broker
 
-    temperature_sensor1 = TemperatureSensor("temperature sensor 1")
-    temperature_sensor2 = TemperatureSensor("temperature sensor 2")
+    temperature_sensor1 = TemperatureSensor("temperature sensor 1", 'sensors/temperature/kitchen')
+    temperature_sensor2 = TemperatureSensor("temperature sensor 2", 'sensors/temperature/bedroom')
 
-    humidity_sensor1 = HumiditySensor("humidity sensor 1")
-    humidity_sensor2 = HumiditySensor("humidity sensor 2")
+    humidity_sensor1 = HumiditySensor("humidity sensor 1", 'sensors/humidity/kitchen')
+    humidity_sensor2 = HumiditySensor("humidity sensor 2", 'sensors/humidity/bedroom')
 
     subscriber1 = Subscriber('subscriber 1')
     subscriber2 = Subscriber('subscriber 2')
@@ -124,6 +177,14 @@ def main() -> int:
     humidity_sensor1.register(subscriber2, group2)
     humidity_sensor2.register(subscriber3, group2)
 
+    # everything from the kitchen, whatever it measures
+    subscriber4 = Subscriber('subscriber 4')
+    broker.subscribe('sensors/+/kitchen', subscriber4)
+
+    # only the warm readings
+    alarm = Subscriber('alarm')
+    temperature_sensor2.register(alarm, group1, low=35)
+
     temperature_sensor1.data = 10
     temperature_sensor1.data = 20
     temperature_sensor2.data = 30
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+"""Routing sensor topics to 300 000 subscriptions - a scan of all the patterns
+vs the topic trie, with and without the match cache."""
+
+import random
+import time
+from typing import Callable, List
+
+from observer.topics import MULTI, SINGLE, TopicTrie, split
+
+SUBSCRIPTIONS = 300_000
+PUBLISHES = 100_000
+KINDS = [f'kind{number}' for number in range(50)]
+ROOMS = [f'room{number}' for number in range(200)]
+DEVICES = [f'device{number}' for number in range(20)]
+
+
+def matches(pattern: List[str], topic: List[str]) -> bool:
+    for position, level in enumerate(pattern):
+        if level == MULTI:
+            return True
+        if position == len(topic) or level not in (SINGLE, topic[position]):
+            return False
+    return len(pattern) == len(topic)
+
+
+def random_pattern(rng: random.Random) -> str:
+    levels = ['sensors', rng.choice(KINDS), rng.choice(ROOMS), rng.choice(DEVICES)]
+    wildcard = rng.random()
+    if wildcard < 0.05:
+        levels[rng.randrange(1, 4)] = SINGLE
+    elif wildcard < 0.06:
+        levels[rng.randrange(2, 4):] = [MULTI]
+    return '/'.join(levels)
+
+
+def timed(label: str, count: int, run: Callable[[], int]) -> int:
+    start = time.perf_counter()
+    delivered = run()
+    seconds = time.perf_counter() - start
+    print(f'{label:40} {seconds:6.2f} s  {seconds / count * 1e6:9.2f} us/publish')
+    return delivered
+
+
+def main() -> int:
+    rng = random.Random(1)
+    patterns = [random_pattern(rng) for _ in range(SUBSCRIPTIONS)]
+    topics = [
+        f'sensors/{rng.choice(KINDS)}/{rng.choice(ROOMS)}/{rng.choice(DEVICES)}' for _ in range(PUBLISHES)
+    ]
+
+    trie = TopicTrie()
+    start = time.perf_counter()
+    for subscriber, pattern in enumerate(patterns):
+        trie.subscribe(pattern, subscriber)
+    print(f'{len(trie):,} subscriptions in {time.perf_counter() - start:.2f} s')
+
+    split_patterns = [(split(pattern), subscriber) for subscriber, pattern in enumerate(patterns)]
+    few = topics[:20]
+    scanned = timed('scan of all the patterns', len(few), lambda: sum(
+        1 for topic in few for pattern, _ in split_patterns if matches(pattern, split(topic))
+    ))
+    assert scanned == sum(len(trie._walk(split(topic))) for topic in few)
+
+    walked = timed('trie walk, no cache', len(topics), lambda: sum(
+        len(trie._walk(split(topic))) for topic in topics
+    ))
+    timed('trie.match, cold cache', len(topics), lambda: sum(len(trie.match(topic)) for topic in topics))
+    cached = timed('trie.match, warm cache', len(topics), lambda: sum(len(trie.match(topic)) for topic in topics))
+    assert walked == cached
+    print(f'{cached / len(topics):.1f} subscribers per publish')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
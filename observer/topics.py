@@ -0,0 +1,136 @@
+"""Hierarchical topics for the observer pattern.
+
+Topics are paths like 'sensors/temperature/kitchen'. A subscription pattern
+may use the MQTT wildcards: '+' matches exactly one level, '#' (the last
+level only) matches any number of levels, none included, so 'sensors/#'
+matches 'sensors' as well.
+
+Patterns are stored in a trie, one level per node. The subscribers of a
+concrete topic are cached, the cache is dropped on every subscription change,
+so publishing to a known topic is one dict lookup.
+"""
+
+from __future__ import annotations
+
+SINGLE = '+'
+MULTI = '#'
+
+
+def split(topic: str) -> list[str]:
+    return topic.split('/')
+
+
+def validate(pattern: str) -> list[str]:
+    levels = split(pattern)
+    for position, level in enumerate(levels):
+        if MULTI in level and (level != MULTI or position != len(levels) - 1):
+            raise ValueError(f"'#' has to be the whole last level, not {pattern!r}")
+        if SINGLE in level and level != SINGLE:
+            raise ValueError(f"'+' has to be a whole level, not {pattern!r}")
+    return levels
+
+
+class _Node:
+
+    __slots__ = ('children', 'subscribers')
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.subscribers: dict[object, None] = {}    # ordered set
+
+
+class TopicTrie:
+
+    def __init__(self, cache_size: int = 100_000) -> None:
+        self.root = _Node()
+        self.cache: dict[str, tuple[object, ...]] = {}
+        self.cache_size = cache_size
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def subscribe(self, pattern: str, subscriber: object) -> None:
+        node = self.root
+        for level in validate(pattern):
+            node = node.children.setdefault(level, _Node())
+        if subscriber not in node.subscribers:
+            node.subscribers[subscriber] = None
+            self.count += 1
+            self._invalidate()
+
+    def unsubscribe(self, pattern: str, subscriber: object) -> None:
+        path = [self.root]
+        for level in validate(pattern):
+            node = path[-1].children.get(level)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1].subscribers.pop(subscriber, 0) is None:
+            self.count -= 1
+            self._invalidate()
+            # drop the nodes nobody needs any more
+            for parent, level, node in zip(reversed(path[:-1]), reversed(split(pattern)), reversed(path)):
+                if node.children or node.subscribers:
+                    break
+                del parent.children[level]
+
+    def _invalidate(self) -> None:
+        if self.cache:
+            self.cache = {}
+
+    def match(self, topic: str) -> tuple[object, ...]:
+        """Subscribers of all the patterns matching the topic, each once."""
+        subscribers = self.cache.get(topic)
+        if subscribers is None:
+            subscribers = tuple(self._walk(split(topic)))
+            if len(self.cache) >= self.cache_size:
+                self.cache = {}
+            self.cache[topic] = subscribers
+        return subscribers
+
+    def _walk(self, levels: list[str]) -> dict[object, None]:
+        found: dict[object, None] = {}
+        nodes = [self.root]
+        for level in levels:
+            following = []
+            for node in nodes:
+                children = node.children
+                if MULTI in children:
+                    found.update(children[MULTI].subscribers)
+                child = children.get(level)
+                if child is not None:
+                    following.append(child)
+                child = children.get(SINGLE)
+                if child is not None:
+                    following.append(child)
+            if not following:
+                return found
+            nodes = following
+        for node in nodes:
+            found.update(node.subscribers)
+            # 'a/#' matches 'a' too
+            child = node.children.get(MULTI)
+            if child is not None:
+                found.update(child.subscribers)
+        return found
+
+
+class Broker:
+    """Delivers a publisher's update to the subscribers of its topic."""
+
+    def __init__(self) -> None:
+        self.topics = TopicTrie()
+
+    def subscribe(self, pattern: str, subscriber: object) -> None:
+        self.topics.subscribe(pattern, subscriber)
+
+    def unsubscribe(self, pattern: str, subscriber: object) -> None:
+        self.topics.unsubscribe(pattern, subscriber)
+
+    def publish(self, topic: str, publisher: object) -> None:
+        for subscriber in self.topics.match(topic):
+            subscriber.update(publisher)
+
+
+broker = Broker()
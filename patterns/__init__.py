@@ -0,0 +1,5 @@
+"""Command line entry point and shared helpers of the pattern examples.
+
+Run an example with ``python -m patterns EXAMPLE [ARGS ...]``, list them with
+``python -m patterns list``.
+"""
@@ -0,0 +1,62 @@
+"""Run one of the pattern examples.
+
+    python -m patterns list
+    python -m patterns EXAMPLE [ARGS ...]
+
+EXAMPLE is a module like 'mvc.quote_server' or just 'quote_server' when the
+name is unique. Only the chosen example is imported, it runs as if it was
+started with 'python -m', so it gets ARGS in sys.argv.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ('adapter', 'factory', 'flightweight', 'mvc', 'observer', 'proxy', 'strategy')
+
+
+def examples() -> dict[str, list[str]]:
+    """{short name: [module, ...]}, found without importing anything."""
+    found: dict[str, list[str]] = {}
+    for package in PACKAGES:
+        for filename in sorted(os.listdir(os.path.join(ROOT, package))):
+            name, extension = os.path.splitext(filename)
+            if extension == '.py' and name != '__init__':
+                found.setdefault(name, []).append(f'{package}.{name}')
+    return found
+
+
+def resolve(name: str) -> str:
+    found = examples()
+    if name in (module for modules in found.values() for module in modules):
+        return name
+    modules = found.get(name)
+    if not modules:
+        raise SystemExit(f'Unknown example {name!r}, see: python -m patterns list')
+    if len(modules) > 1:
+        raise SystemExit(f'Example {name!r} is ambiguous, use one of {", ".join(modules)}')
+    return modules[0]
+
+
+def main(argv: list[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(__doc__.strip())
+        return 0
+    if argv[0] == 'list':
+        print('\n'.join(sorted(module for modules in examples().values() for module in modules)))
+        return 0
+
+    import runpy    # only when an example runs, keeps 'list' and '--help' fast
+
+    module = resolve(argv[0])
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    sys.argv = [module, *argv[1:]]
+    runpy.run_module(module, run_name='__main__', alter_sys=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
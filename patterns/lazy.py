@@ -0,0 +1,31 @@
+"""Lazily imported modules, for dependencies only some code paths need."""
+
+import importlib.util
+import sys
+import types
+
+
+class MissingModule(types.ModuleType):
+    """Stand-in of a module which is not installed, fails on the first use."""
+
+    def __getattr__(self, name: str):
+        raise ModuleNotFoundError(f'No module named {self.__name__!r}', name=self.__name__)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Module which is executed on the first attribute access.
+
+    Only top-level modules, finding a submodule would import its parent.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
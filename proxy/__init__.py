@@ -0,0 +1 @@
+"""Proxy pattern examples."""
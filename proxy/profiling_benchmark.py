@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""Overhead of the ProfilingProxy at different sampling rates."""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from factory.parser import parser_factory
+from observer.observer import Group, Publisher, Subscriber
+from proxy.profiling_proxy import Profiler
+
+CALLS = 200_000
+
+
+class QuietSubscriber(Subscriber):
+
+    def update(self, publisher: Publisher) -> None:
+        pass
+
+
+def per_call(run: Callable[[], object], calls: int) -> float:
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def compare(label: str, make: Callable[[], object], call: Callable, calls: int) -> None:
+    target = make()
+    direct = per_call(lambda: call(target), calls)
+    print(f'{label:34} direct {direct * 1e9:9.0f} ns')
+    for every, memory in (1, False), (1, True), (100, False), (1000, False):
+        profiler = Profiler(sample_every=every, trace_memory=memory)
+        proxy = profiler.wrap(make())
+        try:
+            seconds = per_call(lambda: call(proxy), calls)
+        finally:
+            if memory:
+                tracemalloc.stop()
+        print(f'{"":34} sample_every={every:<5} {"tracemalloc" if memory else "":11} '
+              f'{seconds * 1e9:9.0f} ns  overhead {seconds / direct - 1:+7.1%}')
+
+
+def main() -> int:
+    def publisher() -> Publisher:
+        publisher, group = Publisher('sensor'), Group('sensors')
+        for number in range(10):
+            publisher.register(QuietSubscriber(f'subscriber {number}'), group)
+        return publisher
+
+    compare('Publisher.notify, 10 subscribers', publisher, lambda target: target.notify(), CALLS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'menu.json')
+        with open(path, encoding='utf-8', mode='w') as fh:
+            json.dump({'pizza': [{'name': f'pizza {i}', 'price': i} for i in range(20)]}, fh)
+
+        class Parsers:
+            def parse(self) -> object:
+                return parser_factory(path)
+
+        compare('parser_factory, json', Parsers, lambda target: target.parse(), CALLS // 20)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
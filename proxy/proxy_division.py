@@ -2,8 +2,6 @@ import abc
 import logging
 from typing import Union
 
-logging.basicConfig(level=logging.INFO)
-
 
 ### WITHOUT PROXY
 # def division(a: Union[float, int], b: Union[float, int]) ->  Union[float, int]:
@@ -87,5 +85,13 @@ class ProxyDivision(DivisionInterface):
         return self.division().div(a, b)
 
 
-div = ProxyDivision()
-print(div.div(1, 2))
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    div = ProxyDivision()
+    print(div.div(1, 2))
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -3,7 +3,10 @@ import logging
 import sys
 from functools import lru_cache
 
-import requests
+from patterns.lazy import lazy_import
+
+# imported on the first request, not with this module
+requests = lazy_import('requests')
 
 
 class GetUrlInterface(abc.ABC):
@@ -1,34 +1,41 @@
 """Use proxy pattern as a simple language translator."""
 
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Union
 
 
 class English:
 
+    phrase = '{} is saying: "Hello"'
+
     def __init__(self, name: str) -> None:
         self.name = name
 
     @property
     def hello(self) -> str:
-        return f'{self.name} is saying: "Hello"'
+        return self.phrase.format(self.name)
 
 class Slovak:
 
+    phrase = '{} hovori: "Cau"'
+
     def __init__(self, name: str) -> None:
         self.name = name
 
     @property
     def cau(self) -> str:
-        return f'{self.name} hovori: "Cau"'
+        return self.phrase.format(self.name)
 
 class Czech:
 
+    phrase = '{} rika: "Ahoj"'
+
     def __init__(self, name: str) -> None:
         self.name = name
 
     @property
     def ahoj(self) -> str:
-        return f'{self.name} rika: "Ahoj"'
+        return self.phrase.format(self.name)
 
 
 # Proxy Pattern
@@ -45,6 +52,60 @@ class GreetProxy:
         return getattr(self.speaker, attr)
 
 
+class TranslationService:
+    """Greets in the speaker's language without a proxy per speaker.
+
+    The phrase of every language is compiled once into a bound str.format,
+    translated (language, name) pairs are kept in an LRU cache.
+    """
+
+    def __init__(self, languages: Iterable[type] = (English, Slovak, Czech), cache_size: int = 4096) -> None:
+        self.templates: Dict[str, Callable[[str], str]] = {}
+        self.translate = lru_cache(maxsize=cache_size)(self._render)
+        for language in languages:
+            self.register(language)
+
+    def register(self, language: type) -> None:
+        self.templates[language.__name__] = language.phrase.format
+        # greetings cached with a replaced phrase are stale
+        self.translate.cache_clear()
+
+    def _render(self, language: str, name: str) -> str:
+        try:
+            template = self.templates[language]
+        except KeyError:
+            raise KeyError(f'Unknown language {language!r}, use one of {list(self.templates)}') from None
+        return template(name)
+
+    def greet(self, speaker: Union[English, Slovak, Czech, GreetProxy]) -> str:
+        if isinstance(speaker, GreetProxy):
+            speaker = speaker.speaker
+        return self.translate(type(speaker).__name__, speaker.name)
+
+    def translate_many(self, speakers: Iterable[Union[English, Slovak, Czech, GreetProxy]]) -> List[str]:
+        """Greetings of all the speakers, in their order.
+
+        The template of every language present is looked up once, then all
+        the greetings are rendered in one pass - no proxy, no attribute
+        lookup chain and no cache bookkeeping per speaker.
+        """
+        speakers = list(speakers)
+        languages = set(map(type, speakers))
+        if GreetProxy in languages:
+            speakers = [speaker.speaker if type(speaker) is GreetProxy else speaker for speaker in speakers]
+            languages = set(map(type, speakers))
+        templates = {}
+        for language in languages:
+            template = self.templates.get(language.__name__)
+            if template is None:
+                self._render(language.__name__, '')    # raises the KeyError
+            templates[language] = template
+        return [templates[type(speaker)](speaker.name) for speaker in speakers]
+
+
+translator = TranslationService()
+
+
 def main() -> int:
     slovak = GreetProxy(Slovak('Michal'), 'cau')
     czech = GreetProxy(Czech('Pepa'), 'ahoj')
@@ -55,6 +116,12 @@ def main() -> int:
     print(english.greet)
     print(f'English name is {english.name!r}')
 
+    # the service greets whole lists of speakers at once
+    speakers = [Slovak('Michal'), Czech('Pepa'), English('John'), Slovak('Jana')]
+    for greeting in translator.translate_many(speakers):
+        print(greeting)
+    print(translator.translate('Czech', 'Jana'))
+
     return 0
 
 
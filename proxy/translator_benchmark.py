@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+"""Greeting 10^6 speakers - a GreetProxy each vs the translation service."""
+
+import random
+import time
+from typing import Callable
+
+from proxy.proxy_translator import Czech, English, GreetProxy, Slovak, TranslationService
+
+COUNT = 1_000_000
+METHODS = {English: 'hello', Slovak: 'cau', Czech: 'ahoj'}
+
+
+def timed(label: str, run: Callable[[], list]) -> list:
+    start = time.perf_counter()
+    greetings = run()
+    seconds = time.perf_counter() - start
+    print(f'{label:40} {seconds:6.2f} s  {seconds / COUNT * 1e9:6.0f} ns/speaker')
+    return greetings
+
+
+def main() -> int:
+    rng = random.Random(1)
+    names = [f'user{number}' for number in range(10_000)]
+    speakers = [rng.choice(list(METHODS))(rng.choice(names)) for _ in range(COUNT)]
+    service = TranslationService()
+
+    expected = timed('GreetProxy(...).greet', lambda: [
+        GreetProxy(speaker, METHODS[type(speaker)]).greet for speaker in speakers
+    ])
+    assert timed('service.greet, cached', lambda: [service.greet(speaker) for speaker in speakers]) == expected
+    assert timed('service.translate_many', lambda: service.translate_many(speakers)) == expected
+    print(service.translate.cache_info())
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
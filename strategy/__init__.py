@@ -0,0 +1 @@
+"""Strategy pattern examples."""
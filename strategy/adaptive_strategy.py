@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""Strategy design pattern - choosing the strategy by measurement.
+
+With Duck the client picks the strategy and can swap it at runtime through
+the flying_strategy setter. When several strategies give the same result and
+differ only in speed, the context can make that choice itself: it times every
+registered strategy on live calls and routes to the fastest one
+(epsilon-greedy - mostly exploit the fastest, sometimes explore the others,
+so it notices when they change).
+"""
+
+import math
+import random
+import time
+from collections import deque
+from typing import Dict, List, Sequence
+
+from strategy.duck_strategy import Duck, IFlyBehavior, MigratingFlyingStrategy, NoQuackStrategy, strategies
+
+
+class LatencyStats:
+    """Latency of one strategy, exponentially weighted and recent samples."""
+
+    def __init__(self, alpha: float, window: int) -> None:
+        self.alpha = alpha
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.ewma = 0.0
+        self.samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        if self.count == self.failures or self.ewma == math.inf:
+            # the first success, or the first one after a failure
+            self.ewma = seconds
+        else:
+            self.ewma += self.alpha * (seconds - self.ewma)
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def record_failure(self) -> None:
+        """A failed call is infinitely slow, until the strategy succeeds again."""
+        self.count += 1
+        self.failures += 1
+        self.ewma = math.inf
+
+    @property
+    def mean(self) -> float:
+        succeeded = self.count - self.failures
+        return self.total / succeeded if succeeded else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class AdaptiveStrategy:
+    """Context which routes calls to the currently fastest strategy."""
+
+    def __init__(
+        self,
+        candidates: Sequence[object],
+        method: str,
+        epsilon: float = 0.05,
+        warmup: int = 3,
+        alpha: float = 0.2,
+        window: int = 256,
+        seed: int = None,
+        ) -> None:
+        if not candidates:
+            raise ValueError('At least one strategy is needed')
+        self.candidates = list(candidates)
+        self.method = method
+        self.epsilon = epsilon
+        self.warmup = warmup
+        self.stats: Dict[int, LatencyStats] = {
+            index: LatencyStats(alpha, window) for index in range(len(self.candidates))
+        }
+        self._random = random.Random(seed)
+
+    def choose(self) -> int:
+        for index, stats in self.stats.items():
+            if stats.count < self.warmup:
+                return index
+        if self._random.random() < self.epsilon:
+            return self._random.randrange(len(self.candidates))
+        return self.best_index
+
+    @property
+    def best_index(self) -> int:
+        return min(self.stats, key=lambda index: self.stats[index].ewma)
+
+    @property
+    def best(self) -> object:
+        return self.candidates[self.best_index]
+
+    def __call__(self, *args, **kwargs):
+        index = self.choose()
+        start = time.perf_counter()
+        try:
+            result = getattr(self.candidates[index], self.method)(*args, **kwargs)
+        except Exception:
+            # out of warmup and last in the ranking, only exploration retries it
+            self.stats[index].record_failure()
+            raise
+        self.stats[index].record(time.perf_counter() - start)
+        return result
+
+    def report(self) -> List[str]:
+        lines = []
+        for index, stats in self.stats.items():
+            marker = '*' if index == self.best_index else ' '
+            lines.append(
+                f'{marker} {type(self.candidates[index]).__name__:28} calls={stats.count:6} '
+                f'failures={stats.failures:4} '
+                f'mean={stats.mean * 1e6:9.2f} us  ewma={stats.ewma * 1e6:9.2f} us  '
+                f'p99={stats.percentile(99) * 1e6:9.2f} us'
+            )
+        return lines
+
+
+class AdaptiveFlyingStrategy(AdaptiveStrategy, IFlyBehavior):
+    """Adaptive context which is itself a flying strategy, so a Duck can use it."""
+
+    def __init__(self, candidates: Sequence[IFlyBehavior], **kwargs) -> None:
+        super().__init__(candidates, 'fly', **kwargs)
+
+    def fly(self) -> str:
+        return self()
+
+
+class PlainMigratingFlyingStrategy(MigratingFlyingStrategy):
+    """The same result as MigratingFlyingStrategy, computed on every call."""
+
+    def fly(self) -> str:
+        return MigratingFlyingStrategy.fly.__wrapped__(self)
+
+
+def main() -> int:
+    route = tuple((i, i * i % 97) for i in range(200))
+    adaptive = AdaptiveFlyingStrategy(
+        [PlainMigratingFlyingStrategy(route), strategies.get(MigratingFlyingStrategy, route)],
+        seed=42,
+    )
+    goose = Duck(name='wild goose', flying_behaviour=adaptive, quack_behaviour=strategies.get(NoQuackStrategy))
+
+    for _ in range(10_000):
+        goose.describe()
+    goose.display()
+    print(*adaptive.report(), sep='\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""Memory and throughput of Duck contexts and their strategies.
+
+Compares the original way - a new strategy instance for every duck and a
+__dict__ per Duck - with interned strategies from the registry and the
+slotted Duck.
+"""
+
+import time
+import tracemalloc
+
+from strategy.duck_strategy import (
+    Duck,
+    JetFlyingStrategy,
+    MigratingFlyingStrategy,
+    SimpleFlyingStrategy,
+    SimpleQuackStrategy,
+    strategies,
+)
+
+
+class DictDuck(Duck):
+    """Duck with a per instance __dict__, like before __slots__."""
+
+
+def flock(duck_class: type, count: int, interned: bool) -> list:
+    if interned:
+        return [
+            duck_class(f'duck {i}', strategies.get(SimpleFlyingStrategy), strategies.get(SimpleQuackStrategy))
+            for i in range(count)
+        ]
+    return [duck_class(f'duck {i}', SimpleFlyingStrategy(), SimpleQuackStrategy()) for i in range(count)]
+
+
+def measure(duck_class: type, count: int, interned: bool) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    ducks = flock(duck_class, count, interned)
+    created = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for duck in ducks:
+        duck.flying_strategy = strategies.get(JetFlyingStrategy) if interned else JetFlyingStrategy()
+        duck.describe()
+    used = time.perf_counter() - start
+
+    label = f'{duck_class.__name__}, {"interned" if interned else "new"} strategies'
+    print(
+        f'{label:32} {memory / count:6.0f} B/duck  '
+        f'create {count / created:10,.0f}/s  swap+describe {count / used:10,.0f}/s'
+    )
+
+
+def main() -> int:
+    count = 500_000
+    measure(DictDuck, count, interned=False)
+    measure(Duck, count, interned=False)
+    measure(Duck, count, interned=True)
+
+    route = tuple((i, i * i % 97) for i in range(200))
+    migrating = strategies.get(MigratingFlyingStrategy, route)
+    calls = 20_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        MigratingFlyingStrategy.fly.__wrapped__(migrating)
+    uncached = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        migrating.fly()
+    cached = time.perf_counter() - start
+    print(f'MigratingFlyingStrategy.fly(): {calls / uncached:12,.0f}/s uncached, {calls / cached:12,.0f}/s memoized')
+    print(MigratingFlyingStrategy.fly.cache_info())
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""Strategy design pattern over whole populations of ducks.
+
+A Duck (context) holds references to its strategy objects and every
+display() dispatches to them again. A flock of millions of ducks shares just
+a handful of strategies, so the population stores each duck's strategies as a
+small integer code in a typed array and evaluates every strategy only once,
+for all ducks that use it at the same time.
+"""
+
+import time
+from array import array
+from collections import deque
+from itertools import compress
+from typing import Dict, Hashable, List, Sequence
+
+from strategy.duck_strategy import (
+    Duck,
+    IFlyBehavior,
+    IQuackBehavior,
+    JetFlyingStrategy,
+    NoFlyingStrategy,
+    NoQuackStrategy,
+    SimpleFlyingStrategy,
+    SimpleQuackStrategy,
+)
+
+
+def behaviour(strategy: object) -> Hashable:
+    """Strategies of the same class and the same state behave the same.
+
+    Like the keys of StrategyRegistry, so a new SimpleFlyingStrategy() per
+    duck is still one behaviour. Unhashable state is told apart by identity.
+    """
+    try:
+        key = (type(strategy), tuple(vars(strategy).items()))
+        hash(key)
+    except TypeError:
+        return id(strategy)
+    return key
+
+
+class StrategyTable:
+    """Strategy objects and their small integer codes, one per behaviour."""
+
+    def __init__(self) -> None:
+        self.strategies: List[object] = []
+        self._codes: Dict[Hashable, int] = {}
+
+    def code(self, strategy: object) -> int:
+        key = behaviour(strategy)
+        code = self._codes.get(key)
+        if code is None:
+            if len(self.strategies) == 256:
+                raise ValueError('Only 256 different strategies fit into the code array')
+            code = self._codes[key] = len(self.strategies)
+            self.strategies.append(strategy)
+        return code
+
+    def evaluate(self, codes: array, method: str) -> list:
+        """Call method(mask) once per strategy and spread the results to the ducks."""
+        raw = codes.tobytes()
+        shared = [None] * len(self.strategies)
+        scattered = []
+        for code, strategy in enumerate(self.strategies):
+            # map the selected code to 1 and everything else to 0, in C
+            table = bytearray(256)
+            table[code] = 1
+            mask = raw.translate(table)
+            if 1 not in mask:
+                continue
+            values = getattr(strategy, method)(mask)
+            if values.count(values[0]) == len(values):
+                shared[code] = values[0]
+            else:
+                scattered.append((mask, values))
+
+        out = list(map(shared.__getitem__, codes))
+        for mask, values in scattered:
+            deque(map(out.__setitem__, compress(range(len(mask)), mask), values), maxlen=0)
+        return out
+
+
+class DuckPopulation:
+    """Context for many ducks at once."""
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.fly_codes = array('B')
+        self.quack_codes = array('B')
+        self._fly_table = StrategyTable()
+        self._quack_table = StrategyTable()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, flying_behaviour: IFlyBehavior, quack_behaviour: IQuackBehavior) -> int:
+        self.names.append(name)
+        self.fly_codes.append(self._fly_table.code(flying_behaviour))
+        self.quack_codes.append(self._quack_table.code(quack_behaviour))
+        return len(self.names) - 1
+
+    def add_many(self, names: Sequence[str], flying_behaviour: IFlyBehavior, quack_behaviour: IQuackBehavior) -> None:
+        self.names.extend(names)
+        self.fly_codes.extend(array('B', [self._fly_table.code(flying_behaviour)]) * len(names))
+        self.quack_codes.extend(array('B', [self._quack_table.code(quack_behaviour)]) * len(names))
+
+    @classmethod
+    def from_ducks(cls, ducks: Sequence[Duck]) -> 'DuckPopulation':
+        population = cls()
+        for duck in ducks:
+            population.add(duck.name, duck.flying_strategy, duck.quack_strategy)
+        return population
+
+    # able to change the behaviours at runtime, like Duck
+    def set_flying_strategy(self, index: int, flying_behaviour: IFlyBehavior) -> None:
+        self.fly_codes[index] = self._fly_table.code(flying_behaviour)
+
+    def set_quack_strategy(self, index: int, quack_behaviour: IQuackBehavior) -> None:
+        self.quack_codes[index] = self._quack_table.code(quack_behaviour)
+
+    def duck(self, index: int) -> Duck:
+        return Duck(
+            name=self.names[index],
+            flying_behaviour=self._fly_table.strategies[self.fly_codes[index]],
+            quack_behaviour=self._quack_table.strategies[self.quack_codes[index]],
+        )
+
+    def fly(self) -> List[str]:
+        return self._fly_table.evaluate(self.fly_codes, 'fly_many')
+
+    def quack(self) -> List[str]:
+        return self._quack_table.evaluate(self.quack_codes, 'quack_many')
+
+    def describe(self) -> List[str]:
+        return [
+            f'{name} can {fly} and can {quack}'
+            for name, fly, quack in zip(self.names, self.fly(), self.quack())
+        ]
+
+    def display(self) -> None:
+        print(*self.describe(), sep='\n')
+
+
+def benchmark(count: int = 1_000_000) -> None:
+    kinds = [
+        (SimpleFlyingStrategy(), SimpleQuackStrategy()),
+        (JetFlyingStrategy(), SimpleQuackStrategy()),
+        (NoFlyingStrategy(), NoQuackStrategy()),
+    ]
+    ducks = [Duck(f'duck {i}', *kinds[i % len(kinds)]) for i in range(count)]
+
+    population = DuckPopulation.from_ducks(ducks)
+
+    def timed(run):
+        start = time.perf_counter()
+        result = run()
+        return result, time.perf_counter() - start
+
+    expected, loop = timed(lambda: (
+        [duck.flying_strategy.fly() for duck in ducks],
+        [duck.quack_strategy.quack() for duck in ducks],
+    ))
+    result, vectorized = timed(lambda: (population.fly(), population.quack()))
+    assert result == expected
+    print(f'strategies, loop over Duck: {loop:.3f} s')
+    print(f'strategies, DuckPopulation: {vectorized:.3f} s ({loop / vectorized:.1f}x)')
+
+    # building a million strings costs the same either way, it dominates here
+    expected, loop = timed(lambda: [duck.describe() for duck in ducks])
+    result, vectorized = timed(population.describe)
+    assert result == expected
+    print(f'describe(), loop over Duck: {loop:.3f} s')
+    print(f'describe(), DuckPopulation: {vectorized:.3f} s ({loop / vectorized:.1f}x)')
+
+
+def main() -> int:
+    population = DuckPopulation()
+    wild = population.add('wild duck', SimpleFlyingStrategy(), SimpleQuackStrategy())
+    population.add('cloud duck', JetFlyingStrategy(), SimpleQuackStrategy())
+    population.add('rubber duck', NoFlyingStrategy(), NoQuackStrategy())
+    population.display()
+
+    population.set_flying_strategy(wild, JetFlyingStrategy())
+    population.display()
+
+    benchmark()
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
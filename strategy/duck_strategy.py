@@ -13,7 +13,42 @@ Other materials used:
 https://refactoring.guru/design-patterns/strategy
 """
 
+import math
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+
+def cacheable(maxsize: int = 1024):
+    """Mark a method of a pure strategy.
+
+    Results are memoized per (strategy, args), the least recently used
+    ones are evicted when maxsize is reached.
+    """
+    return lru_cache(maxsize=maxsize)
+
+
+class StrategyRegistry:
+    """Interns strategies - one shared instance per class and arguments.
+
+    Stateless strategies don't need a new instance for every duck.
+    """
+
+    def __init__(self) -> None:
+        self._strategies: Dict[Tuple[type, tuple], object] = {}
+
+    def __len__(self) -> int:
+        return len(self._strategies)
+
+    def get(self, strategy_class: type, *args):
+        key = (strategy_class, args)
+        strategy = self._strategies.get(key)
+        if strategy is None:
+            strategy = self._strategies[key] = strategy_class(*args)
+        return strategy
+
+
+strategies = StrategyRegistry()
 
 # Let's create abstract classes first which implement
 # different Duck behaviours.
@@ -25,6 +60,13 @@ class IFlyBehavior(ABC):
         """Needs to be implemented in the respective Strategy class."""
         return
 
+    def fly_many(self, mask: bytes) -> List[str]:
+        """Fly all ducks selected by the mask (one byte per duck, 1 = selected).
+
+        Strategies don't depend on the duck, so fly() is evaluated only once.
+        """
+        return [self.fly()] * mask.count(1)
+
 
 class IQuackBehavior(ABC):
     """Quack behavior."""
@@ -34,6 +76,10 @@ class IQuackBehavior(ABC):
         """Needs to be implemented in the respective Strategy class."""
         return
 
+    def quack_many(self, mask: bytes) -> List[str]:
+        """Quack all ducks selected by the mask (one byte per duck, 1 = selected)."""
+        return [self.quack()] * mask.count(1)
+
 
 # Now we need to implement the Strategy - classes which inherit from the
 # Behavior abstract classes and implement the neccessary methods.
@@ -60,6 +106,20 @@ class NoFlyingStrategy(IFlyBehavior):
         return 'not fly'
 
 
+# Strategy with parameters, its result depends only on them,
+# so it is marked as cacheable.
+class MigratingFlyingStrategy(IFlyBehavior):
+    """Strategy pattern - inherits from IFlyBehavior."""
+
+    def __init__(self, route: Sequence[Tuple[float, float]]) -> None:
+        self.route = tuple(route)
+
+    @cacheable(maxsize=256)
+    def fly(self) -> str:
+        distance = sum(math.dist(a, b) for a, b in zip(self.route, self.route[1:]))
+        return f'migrate {distance:.0f} km'
+
+
 class SimpleQuackStrategy(IQuackBehavior):
     def quack(self) -> str:
         return 'just quack'
@@ -77,6 +137,8 @@ class Duck:
     and delegates it executing the behavior.
     """
 
+    __slots__ = ('name', '_flying_behaviour', '_quack_behaviour')
+
     def __init__(
         self,
         name: str,
@@ -105,36 +167,45 @@ class Duck:
     def quack_strategy(self, quack_behaviour: IQuackBehavior) -> None:
         self._quack_behaviour = quack_behaviour
 
-    def display(self) -> None:
-        print(
+    def describe(self) -> str:
+        return (
             f'{self.name} can {self._flying_behaviour.fly()} '
             f'and can {self._quack_behaviour.quack()}'
         )
 
+    def display(self) -> None:
+        print(self.describe())
+
 
 if __name__ == "__main__":
 
     # The client code picks a concrete strategy and passes it to the context.
     # The client should be aware of the differences between strategies in order
     # to make the right choice.
-    wild_duck = Duck(name='wild duck', flying_behaviour=SimpleFlyingStrategy(), quack_behaviour=SimpleQuackStrategy())
-    cloud_duck = Duck(name='cloud duck', flying_behaviour=JetFlyingStrategy(), quack_behaviour=SimpleQuackStrategy())
-    rubber_duck = Duck(name='rubber duck', flying_behaviour=NoFlyingStrategy(), quack_behaviour=NoQuackStrategy())
+    # Stateless strategies are shared through the registry.
+    wild_duck = Duck(name='wild duck', flying_behaviour=strategies.get(SimpleFlyingStrategy), quack_behaviour=strategies.get(SimpleQuackStrategy))
+    cloud_duck = Duck(name='cloud duck', flying_behaviour=strategies.get(JetFlyingStrategy), quack_behaviour=strategies.get(SimpleQuackStrategy))
+    rubber_duck = Duck(name='rubber duck', flying_behaviour=strategies.get(NoFlyingStrategy), quack_behaviour=strategies.get(NoQuackStrategy))
     wild_duck.display()
     cloud_duck.display()
     rubber_duck.display()
 
     # We can change the flying behavior at runtime
-    wild_duck.flying_strategy = JetFlyingStrategy()
+    wild_duck.flying_strategy = strategies.get(JetFlyingStrategy)
     wild_duck.display()
 
     # We can also change the quack behavior at runtime
-    rubber_duck.quack_strategy = NoQuackStrategy()
+    rubber_duck.quack_strategy = strategies.get(NoQuackStrategy)
     rubber_duck.display()
 
+    # Strategies with parameters are interned per arguments.
+    migrating = strategies.get(MigratingFlyingStrategy, ((0, 0), (300, 400), (600, 800)))
+    Duck(name='wild goose', flying_behaviour=migrating, quack_behaviour=strategies.get(NoQuackStrategy)).display()
+
     # Output example:
     # wild duck can just fly and can just quack
     # cloud duck can do jet fly and can just quack
     # rubber duck can not fly and can not quack
     # wild duck can do jet fly and can just quack
     # rubber duck can not fly and can not quack
+    # wild goose can migrate 1000 km and can not quack
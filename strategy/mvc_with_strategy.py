@@ -2,11 +2,14 @@
 
 import uuid
 from abc import ABC, abstractmethod
-import tkinter as tk
 import random
 import string
 from typing import Dict, Callable
 
+from patterns.lazy import lazy_import
+
+tk = lazy_import('tkinter')
+
 
 class Model():
     uuid = []